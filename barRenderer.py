@@ -0,0 +1,115 @@
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.transforms import Bbox
+
+class BarRenderer:
+    """ Bar chart animated by blitting only the bars that changed.
+    A static PolyCollection always holds every bar, so full draws (first show, resize) are complete. Each
+    frame erases just the pixel columns of changed bars from the cached bar-free background, repaints the
+    bars overlapping those columns through a small overlay collection and blits, so frame cost follows the
+    number of changed bars rather than the length of the array. """
+
+    def __init__(self, canvas, ax, heights, color="lightblue"):
+        self.canvas = canvas
+        self.ax = ax
+        self.color = to_rgba(color)
+
+        heights = np.asarray(heights, dtype=float)
+        self.n = len(heights)
+
+        self.verts = np.zeros((self.n, 4, 2))
+        self.verts[:, :, 0] = np.arange(self.n)[:, None] + [-0.4, -0.4, 0.4, 0.4]
+        self.verts[:, 1:3, 1] = heights[:, None]
+        self.colors = np.tile(self.color, (self.n, 1))
+
+        self.bars = PolyCollection(self.verts, facecolors=self.colors, edgecolor="none")
+        self.ax.add_collection(self.bars)
+        self.paths = self.bars.get_paths()
+
+        self.overlay = PolyCollection([], edgecolor="none", animated=True)
+        self.ax.add_collection(self.overlay)
+
+        self.ax.set_xlim(-1, self.n)
+        self.ax.set_ylim(0, heights.max() * 1.05 if self.n else 1)
+
+        self.dirty = set()
+        self.background = None
+        self.size = None
+
+    def set_heights(self, indices, heights):
+        indices = np.asarray(indices, dtype=np.int64)
+        self.verts[indices, 1:3, 1] = np.asarray(heights, dtype=float)[:, None]
+
+        for i in indices.tolist():
+            self.paths[i].vertices[1:3, 1] = self.verts[i, 1:3, 1]
+        self.dirty.update(indices.tolist())
+
+    def set_colors(self, indices, color=None):
+        # color None restores the default colour
+        indices = [int(i) for i in indices]
+        self.colors[indices] = self.color if color is None else to_rgba(color)
+        self.dirty.update(indices)
+
+    def blit(self):
+        self.bars.set_facecolor(self.colors)
+        self.bars.stale = True
+
+        if self.background is None or self.canvas.get_width_height() != self.size:
+            self._redraw()
+        elif self.dirty:
+            self._paint(sorted(self.dirty))
+
+        self.dirty.clear()
+        self.canvas.flush_events()
+
+    def _redraw(self):
+        # Captures the axes without bars, then draws all bars over it
+        self.bars.set_visible(False)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.size = self.canvas.get_width_height()
+        self.bars.set_visible(True)
+
+        self.ax.draw_artist(self.bars)
+        self.canvas.blit(self.ax.bbox)
+
+    def _paint(self, indices):
+        # Pixel columns covered by the slots of the changed bars, merged where they touch
+        to_pixels = self.ax.transData.transform
+        edges = to_pixels(np.column_stack((np.repeat(indices, 2) + np.tile([-0.5, 0.5], len(indices)),
+                                           np.zeros(2 * len(indices)))))[:, 0].reshape(-1, 2)
+        left, right = np.floor(edges[:, 0]), np.ceil(edges[:, 1])
+
+        spans = []
+        for x0, x1 in zip(left, right):
+            if spans and x0 <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], x1)
+            else:
+                spans.append([x0, x1])
+
+        # Restores the bar-free background inside each span; region extents are in canvas pixels, y down
+        x_start, y_top, x_end, y_bottom = self.background.get_extents()
+        height = self.canvas.get_width_height()[1]
+        from_pixels = self.ax.transData.inverted().transform
+
+        for x0, x1 in spans:
+            x0, x1 = max(x0, x_start), min(x1, x_end)
+            if x1 <= x0:
+                continue
+            # restore_region includes its right column, the clip box and blit below do not
+            self.canvas.restore_region(self.background, bbox=(x0, y_top, x1 - 1, y_bottom), xy=(x_start, y_top))
+
+            # Every bar reaching into the erased columns is drawn again, clipped to them so that no
+            # antialiased edge outside the span is painted twice
+            low, high = from_pixels([[x0, 0], [x1, 0]])[:, 0]
+            repaint = np.arange(max(0, int(np.floor(low - 0.4))), min(self.n - 1, int(np.ceil(high + 0.4))) + 1)
+
+            # Display coordinates, whose y axis points up
+            span = Bbox([[x0, height - y_bottom], [x1, height - y_top]])
+
+            self.overlay.set_verts(self.verts[repaint])
+            self.overlay.set_facecolor(self.colors[repaint])
+            self.overlay.set_clip_box(span)
+            self.ax.draw_artist(self.overlay)
+            self.canvas.blit(span)
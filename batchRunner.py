@@ -0,0 +1,128 @@
+""" Headless entry point: runs Examples/*/config.txt style experiment files back to back.
+
+    python batchRunner.py Examples/quickSort/config.txt
+    python batchRunner.py Examples --workers 8 --seed 42 --output-dir results
+    python batchRunner.py Examples --resume          # skip the n already in the experiment store
+    python batchRunner.py Examples --from-store      # rebuild the CSVs from the store only
+    python batchRunner.py Examples --raw             # also keep every trial as .npy columns (see rawTrials.py)
+    python batchRunner.py Examples --phases          # time generation / oracle / algorithm phases per n
+    python batchRunner.py Examples --distribution few_unique    # Quick Sort on inputs with 10 distinct keys """
+
+import argparse
+import os
+import sys
+import numpy as np
+
+from experimentEngine import ExperimentConfig, run_experiment, export_stored, has_exact_theory
+from experimentStore import ExperimentStore
+from phaseTiming import PhaseLog, PHASES
+from complexityFit import fit_csv
+from quickSortTheory import z_scores
+from inputDistributions import DISTRIBUTIONS
+from graphSampling import SamplingError
+
+def find_configs(paths):
+    # Expands directories into every config.txt below them, in sorted order
+    configs = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, files in sorted(os.walk(path)):
+                if "config.txt" in files:
+                    configs.append(os.path.join(directory, "config.txt"))
+        else:
+            configs.append(path)
+
+    return configs
+
+def print_progress(message):
+    # Prints the latest point of a Monte Carlo sweep or a histogram summary
+    if message[0] == "histogram":
+        _, results, title, _, exact = message
+        print(f"  {title}: {len(results)} values")
+        if exact is not None and len(results):
+            mean = float(np.dot(np.arange(len(exact)), exact))
+            print(f"  Exact mean {mean:.4f}, sample mean {np.mean(results):.4f}")
+    elif message[0] == "phases":
+        _, n, trials, seconds, rate, phases = message
+        breakdown = ", ".join(f"{name} {phases[name]:.3f} s" for name in PHASES if name in phases)
+        print(f"    {trials} trials in {seconds:.3f} s ({rate:.1f} trials/s): {breakdown}")
+    else:
+        _, n_values, empirical, _, std_dev, _ = message
+        print(f"  n = {n_values[-1]}: mean = {empirical[-1]:.4f}, std dev = {std_dev[-1]:.4f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run simulation experiments without the GUI.")
+    parser.add_argument("paths", nargs="+", help="config.txt files or directories containing them")
+    parser.add_argument("--workers", type=int, help="worker processes (overrides the config file)")
+    parser.add_argument("--seed", type=int, help="root seed (overrides the config file)")
+    parser.add_argument("--metric", help="metric to plot and export, e.g. runtime_ns or peak_bytes (overrides the config file)")
+    parser.add_argument("--output-dir", default=".", help="directory for the exported CSV files")
+    parser.add_argument("--store", default="experiment_store.jsonl", help="append-only file of per-n results")
+    parser.add_argument("--resume", action="store_true", help="reuse stored n of identical configurations")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS,
+                        help="Quick Sort input distribution (overrides the config file)")
+    parser.add_argument("--from-store", action="store_true", help="export stored results without running")
+    parser.add_argument("--raw", action="store_true", help="write raw per-trial results as memory-mapped .npy columns")
+    parser.add_argument("--phases", action="store_true", help="time the phases of every trial and export the breakdown")
+    args = parser.parse_args(argv)
+
+    configs = find_configs(args.paths)
+    if not configs:
+        print("No config.txt files found")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    store = ExperimentStore(args.store)
+    failures = 0
+
+    for path in configs:
+        try:
+            config = ExperimentConfig.from_file(path)
+            if args.workers is not None:
+                config.workers = args.workers
+            if args.seed is not None:
+                config.seed = args.seed
+            if args.metric is not None:
+                config.metric = args.metric
+            if args.distribution is not None:
+                config.distribution = args.distribution
+
+            print(f"{path}: {config.mode} / {config.algorithm}")
+            if args.from_store:
+                file = export_stored(config, store, output_prefix=os.path.join(args.output_dir, ""))
+            else:
+                phases = PhaseLog() if args.phases else None
+                file = run_experiment(
+                    config,
+                    emit=print_progress,
+                    output_prefix=os.path.join(args.output_dir, ""),
+                    store=store,
+                    resume=args.resume,
+                    raw=args.raw,
+                    phases=phases
+                )
+                if phases is not None and phases.file:
+                    print(f"  Phase breakdown saved to {phases.file}")
+            print(f"  Saved to {file}")
+
+            if config.mode == "Monte Carlo":
+                rows, fits = fit_csv(file)
+                if fits:
+                    print(f"  Best fit: {fits[0].describe()} (chi2/dof {fits[0].reduced_chi2():.2f})")
+
+                # Simulated Quick Sort means should lie within a few standard errors of the exact mean
+                if has_exact_theory(config) and rows:
+                    n_values, means, _, trials = zip(*[row[:4] for row in rows])
+                    z = z_scores(n_values, means, trials)
+                    print(f"  Exact mean check: max |z| = {np.abs(z).max():.2f} over {len(z)} input sizes")
+
+        # SamplingError: a graph size the rejection sampler cannot draw connected within its attempt budget
+        except (OSError, ValueError, SamplingError) as e:
+            print(f"  Skipped {path}: {e}")
+            failures += 1
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+""" Wall time and peak memory benchmarks of the simulation kernels, with baseline regression reports.
+
+    python benchmarkSuite.py                                   # every benchmark on its default n grid
+    python benchmarkSuite.py quick_sort karger --n 50 100 --repeat 20
+    python benchmarkSuite.py --save-baseline                   # store the results as the new baseline
+    python benchmarkSuite.py --baseline benchmark_baseline.json --threshold 0.15
+
+Inputs are generated outside the timed region from a fixed seed. Each case runs warmup untimed calls, then
+repeat timed calls, then one more call under tracemalloc for the peak Python heap allocation, so tracing
+never slows the timed calls down. Results are written as JSON; with a baseline, every case whose median
+is more than threshold slower is reported and the exit status is 1. Needs no display and no network. """
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from quickSort import QuickSort
+from randomGraphBFS import RandomGraphBFS
+from kargerMinCut import KargerMinCut
+from minCutOracle import exact_min_cut
+from dataExport import timestamp
+
+def _quick_sort(engine):
+    def setup(n):
+        sorter = QuickSort(engine)
+        arr = np.random.randint(0, 1000000, n).tolist()
+        return lambda: sorter.sort(arr)
+    return setup
+
+def _bfs(backend):
+    def setup(n):
+        bfs = RandomGraphBFS(backend=backend)
+        G = bfs.generate_small_world_graph(n)
+        return lambda: bfs.run_bfs(G)
+    return setup
+
+def _graph_generation(n):
+    karger = KargerMinCut()
+    return lambda: karger.generate_graph(n)
+
+def _karger(n):
+    karger = KargerMinCut()
+    graph = karger.prepare(karger.generate_graph(n))
+    return lambda: karger.run_karger(graph)
+
+def _min_cut_oracle(n):
+    # Times the exact cut itself; the oracle's caches would turn every repeat into a lookup
+    graph = KargerMinCut().to_edge_arrays(KargerMinCut().generate_graph(n))
+    return lambda: exact_min_cut(*graph)
+
+# name -> (setup(n) returning the call to time, default n grid)
+BENCHMARKS = {
+    "quick_sort": (_quick_sort("recursive"), [100, 1000, 10000]),
+    "quick_sort_buffer": (_quick_sort("buffer"), [1000, 10000, 100000]),
+    "bfs_csr": (_bfs("csr"), [100, 1000, 10000]),
+    "bfs_networkx": (_bfs("networkx"), [100, 1000, 10000]),
+    "graph_generation": (_graph_generation, [20, 50, 100]),
+    "karger": (_karger, [20, 50, 100]),
+    "min_cut_oracle": (_min_cut_oracle, [20, 50, 100])
+}
+
+def run_case(name, n, warmup=2, repeat=10, seed=0):
+    """ Times one benchmark at one n. Returns a result dict with wall times in seconds and memory in bytes. """
+    if repeat < 1:
+        raise ValueError("Repeat must be at least 1")
+
+    random.seed(seed)
+    np.random.seed(seed)
+    call = BENCHMARKS[name][0](n)
+
+    for _ in range(warmup):
+        call()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "benchmark": name,
+        "n": n,
+        "median": float(np.median(times)),
+        "p95": float(np.percentile(times, 95)),
+        "min": float(min(times)),
+        "peak_memory": peak,
+        "repeat": repeat
+    }
+
+def run_suite(names=None, n_values=None, warmup=2, repeat=10, seed=0, report=None):
+    """ Runs every (benchmark, n) case; n_values replaces the default grids. report receives each result. """
+    names = names or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark: {name}")
+
+    results = []
+    for name in names:
+        for n in n_values or BENCHMARKS[name][1]:
+            result = run_case(name, n, warmup, repeat, seed)
+            results.append(result)
+            if report:
+                report(result)
+
+    return {
+        "meta": {
+            "created": timestamp(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "warmup": warmup,
+            "repeat": repeat,
+            "seed": seed
+        },
+        "results": results
+    }
+
+def compare(results, baseline, threshold=0.1):
+    """ Matches results to baseline cases by (benchmark, n). Returns (benchmark, n, baseline median, median,
+    ratio, regressed) rows; a case regressed when its median is more than threshold (0.1 = 10%) slower. """
+    reference = {(case["benchmark"], case["n"]): case for case in baseline["results"]}
+    rows = []
+
+    for case in results["results"]:
+        base = reference.get((case["benchmark"], case["n"]))
+        if base is None:
+            continue
+
+        ratio = case["median"] / base["median"]
+        rows.append((case["benchmark"], case["n"], base["median"], case["median"], ratio, ratio > 1 + threshold))
+
+    return rows
+
+def save_results(results, path):
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+def print_result(result):
+    print(f"{result['benchmark']:>16} {result['n']:>7} {result['median'] * 1000:>11.3f} "
+          f"{result['p95'] * 1000:>11.3f} {result['peak_memory'] / 1024:>12.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation kernels.")
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--n", type=int, nargs="+", help="input sizes (replaces the default grid of each benchmark)")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed calls before timing")
+    parser.add_argument("--repeat", type=int, default=10, help="timed calls per case")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated inputs")
+    parser.add_argument("--output", help="results file (default: benchmark_<timestamp>.json)")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown reported as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results to --baseline")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':>16} {'n':>7} {'median (ms)':>11} {'p95 (ms)':>11} {'peak (KiB)':>12}")
+    try:
+        results = run_suite(args.benchmarks, args.n, args.warmup, args.repeat, args.seed, report=print_result)
+    except ValueError as e:
+        print(f"Input Error: {e}")
+        return 2
+
+    output = args.output or f"benchmark_{timestamp()}.json"
+    save_results(results, output)
+    print(f"Saved to {output}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    rows = compare(results, load_results(args.baseline), args.threshold)
+    regressions = [row for row in rows if row[5]]
+
+    print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+    for name, n, base, median, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:>16} {n:>7} {base * 1000:>11.3f} -> {median * 1000:>9.3f} ms {ratio:>6.2f}x {flag}")
+
+    print(f"{len(regressions)} of {len(rows)} cases regressed")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
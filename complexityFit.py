@@ -0,0 +1,145 @@
+""" Fits growth models to the per-n aggregates of a Monte Carlo sweep.
+
+Every candidate (c·n, c·n log n, c·n², c·log n and the power law a·n^α) is fitted by weighted least
+squares with weights trials / variance, the inverse variance of each per-n mean, and the candidates are
+ranked by AIC (chi-square + 2 · parameters). A fit is a few small NumPy operations, so a live sweep can
+refit after every finished n.
+
+    python complexityFit.py quick_sort_monte_carlo_20250101_120000.csv    # fits an exported sweep """
+
+import csv
+import math
+import sys
+import numpy as np
+
+# name -> growth term f(n) of the one-constant models c·f(n)
+MODELS = {
+    "c·n": lambda n: n,
+    "c·n log n": lambda n: n * np.log2(n),
+    "c·n²": lambda n: n ** 2,
+    "c·log n": lambda n: np.log2(n)
+}
+
+POWER_LAW = "a·n^α"
+
+class ModelFit:
+    """ One fitted model: its constants, per-n residuals (mean - fitted) and goodness of fit. """
+
+    def __init__(self, name, params, predict, n, mean, weights):
+        self.name = name
+        self.params = params
+        self.predict = predict
+
+        self.residuals = mean - predict(n)
+        self.chi2 = float(np.sum(weights * self.residuals ** 2))
+        self.dof = len(n) - len(params)
+        self.aic = self.chi2 + 2 * len(params)
+
+    def reduced_chi2(self):
+        return self.chi2 / self.dof if self.dof > 0 else math.nan
+
+    def describe(self):
+        if self.name == POWER_LAW:
+            return f"{self.params[0]:.4g}·n^{self.params[1]:.3f}"
+        return self.name.replace("c", f"{self.params[0]:.4g}", 1)
+
+def fit_models(n, mean, variance, trials):
+    """ Fits every model to the sweep and returns the fits, best (lowest AIC) first.
+    Models with as many constants as data points are skipped, as is the power law unless every mean is
+    positive. Zero variances (deterministic metrics) are raised to the smallest non-zero one. """
+    n = np.asarray(n, dtype=float)
+    mean = np.asarray(mean, dtype=float)
+    weights = _weights(np.asarray(variance, dtype=float), np.asarray(trials, dtype=float))
+
+    fits = []
+    for name, term in MODELS.items():
+        if len(n) < 2:
+            break
+
+        f = term(n)
+        denominator = np.sum(weights * f * f)
+        if denominator > 0:
+            c = float(np.sum(weights * f * mean) / denominator)
+            fits.append(ModelFit(name, [c], lambda x, c=c, term=term: c * term(np.asarray(x, dtype=float)),
+                                 n, mean, weights))
+
+    if len(n) >= 3 and np.all(mean > 0) and np.all(n > 0):
+        a, alpha = _fit_power_law(n, mean, weights)
+        fits.append(ModelFit(POWER_LAW, [a, alpha], lambda x: a * np.asarray(x, dtype=float) ** alpha,
+                             n, mean, weights))
+
+    return sorted(fits, key=lambda fit: fit.aic)
+
+def fit_rows(rows):
+    # Fits exported CSV rows (input_size, mean, variance, trials, ...)
+    columns = list(zip(*rows))
+    return fit_models(*columns[:4]) if rows else []
+
+def fit_csv(path):
+    """ Reads an exported Monte Carlo CSV and returns (rows, fits). """
+    with open(path) as file:
+        reader = csv.reader(file)
+        next(reader)
+        rows = [[float(value) for value in row[:4]] for row in reader]
+
+    return rows, fit_rows(rows)
+
+def _weights(variance, trials):
+    # Inverse variance of each per-n mean
+    variance_of_mean = variance / np.maximum(trials, 1)
+    positive = variance_of_mean[variance_of_mean > 0]
+    floor = positive.min() if positive.size else 1.0
+    return 1.0 / np.maximum(variance_of_mean, floor)
+
+def _fit_power_law(n, mean, weights, iterations=20):
+    """ Weighted least squares for mean ≈ a · n^α: a log-log fit as the start, then Gauss-Newton steps
+    on (log a, α) in the original scale, halved whenever they would increase the chi-square. """
+    log_n = np.log(n)
+
+    # On the log scale the variance of log(mean) is about variance / mean²
+    log_weights = weights * mean ** 2
+    design = np.column_stack((np.ones_like(log_n), log_n))
+    params = np.linalg.lstsq(design * np.sqrt(log_weights)[:, None], np.log(mean) * np.sqrt(log_weights),
+                             rcond=None)[0]
+
+    def chi2(p):
+        return np.sum(weights * (mean - np.exp(p[0] + p[1] * log_n)) ** 2)
+
+    current = chi2(params)
+    for _ in range(iterations):
+        fitted = np.exp(params[0] + params[1] * log_n)
+        jacobian = np.column_stack((fitted, fitted * log_n))
+        sqrt_w = np.sqrt(weights)[:, None]
+
+        step = np.linalg.lstsq(jacobian * sqrt_w, (mean - fitted) * sqrt_w[:, 0], rcond=None)[0]
+
+        scale = 1.0
+        while scale > 1e-4:
+            candidate = params + scale * step
+            value = chi2(candidate)
+            if value <= current:
+                break
+            scale /= 2
+        else:
+            break
+
+        improvement = current - value
+        params, current = candidate, value
+        if improvement <= 1e-12 * max(current, 1e-300):
+            break
+
+    return float(np.exp(params[0])), float(params[1])
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        rows, fits = fit_csv(path)
+
+        print(path)
+        for rank, fit in enumerate(fits):
+            marker = "best" if rank == 0 else f"ΔAIC {fit.aic - fits[0].aic:.1f}"
+            print(f"  {fit.describe():>28}  chi2/dof {fit.reduced_chi2():>9.3f}  {marker}")
+
+        if fits:
+            print("  residuals of the best fit:")
+            for row, residual in zip(rows, fits[0].residuals):
+                print(f"    n = {int(row[0])}: {residual:+.4g}")
@@ -0,0 +1,165 @@
+import numpy as np
+from scipy import sparse
+
+class CSRGraph:
+    """ Compact undirected graph in compressed sparse row form.
+    The neighbors of node v are indices[indptr[v]:indptr[v + 1]]; both arrays are int32 (indptr int64 once the
+    adjacency exceeds 2^31 entries), so graphs with millions of nodes fit where NetworkX dict-of-dicts do not. """
+
+    def __init__(self, n, indptr, indices):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_edges(cls, n, src, dst):
+        """ Builds the symmetric adjacency of the undirected edges (src[i], dst[i]). """
+        heads = np.concatenate((src, dst))
+        tails = np.concatenate((dst, src))
+
+        order = np.argsort(heads, kind="stable")
+        counts = np.bincount(heads, minlength=n)
+
+        index_type = np.int32 if len(heads) < 2 ** 31 else np.int64
+        indptr = np.zeros(n + 1, dtype=index_type)
+        np.cumsum(counts, out=indptr[1:])
+
+        return cls(n, indptr, tails[order].astype(np.int32))
+
+    @classmethod
+    def from_networkx(cls, G):
+        index = {node: i for i, node in enumerate(G.nodes)}
+        m = G.number_of_edges()
+
+        src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int32, count=m)
+        dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int32, count=m)
+
+        return cls.from_edges(len(index), src, dst)
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def neighbors(self, v):
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def gather_neighbors(self, nodes):
+        """ Concatenated neighbor lists of all nodes, without a Python loop. """
+        starts = self.indptr[nodes].astype(np.int64)
+        counts = self.indptr[nodes + 1] - starts
+        total = int(counts.sum())
+
+        # Position of each gathered entry: its row start plus its offset within the row
+        row_offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.indices[row_offsets + np.arange(total)]
+
+    def to_scipy(self):
+        return sparse.csr_matrix((np.ones(len(self.indices)), self.indices, self.indptr), shape=(self.n, self.n))
+
+    def is_connected(self):
+        return self.n == 0 or bfs_levels(self, 0).min() >= 0
+
+def bfs_levels(graph, start_node=0):
+    """ Level-synchronous BFS: expands the whole frontier with array operations each step.
+    Returns the BFS level of every node, -1 for unreachable nodes. """
+    levels = np.full(graph.n, -1, dtype=np.int32)
+    levels[start_node] = 0
+
+    frontier = np.array([start_node], dtype=np.int32)
+    depth = 0
+
+    while frontier.size:
+        neighbors = graph.gather_neighbors(frontier)
+        neighbors = np.unique(neighbors[levels[neighbors] < 0])
+
+        depth += 1
+        levels[neighbors] = depth
+        frontier = neighbors
+
+    return levels
+
+def watts_strogatz_csr(n, k=4, p=0.1):
+    """ NumPy Watts-Strogatz small-world graph: a ring lattice where each node links to its k/2 right-hand
+    neighbors, and each lattice edge is rewired to a uniformly random endpoint with probability p.
+    Rewires that would create a self-loop or a duplicate edge are redrawn a few times, then abandoned. """
+    half = k // 2
+    src = np.repeat(np.arange(n, dtype=np.int64), half)
+    dst = (src + np.tile(np.arange(1, half + 1), n)) % n
+
+    targets = dst.copy()
+    pending = np.flatnonzero(np.random.random(len(src)) < p)
+
+    for _ in range(10):
+        if not pending.size:
+            break
+
+        targets[pending] = np.random.randint(0, n, pending.size)
+
+        keys = _edge_keys(n, src, targets)
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        bad = (src == targets) | (counts[inverse] > 1)
+
+        pending = pending[bad[pending]]
+
+    # Abandoned rewires keep their lattice edge; drop any duplicate that leaves behind
+    targets[pending] = dst[pending]
+    keys = np.unique(_edge_keys(n, src, targets))
+
+    return CSRGraph.from_edges(n, (keys // n).astype(np.int32), (keys % n).astype(np.int32))
+
+def connected_watts_strogatz_csr(n, k=4, p=0.1, tries=100):
+    """ Watts-Strogatz graph that is retried until connected, like nx.connected_watts_strogatz_graph. """
+    for _ in range(tries):
+        graph = watts_strogatz_csr(n, k, p)
+        if graph.is_connected():
+            return graph
+
+    raise RuntimeError("Maximum number of tries exceeded")
+
+def gnp_csr(n, p):
+    """ NumPy Erdos-Renyi G(n, p). Geometric skips between selected node pairs give each of the
+    n(n-1)/2 pairs an independent Bernoulli(p) edge in O(n + m) time and memory. """
+    pairs = n * (n - 1) // 2
+    if pairs == 0 or p <= 0:
+        return CSRGraph.from_edges(n, np.empty(0, np.int32), np.empty(0, np.int32))
+
+    if p >= 1:
+        selected = np.arange(pairs, dtype=np.int64)
+    else:
+        chunks = []
+        position = -1
+        expected = int(pairs * p + 5 * np.sqrt(pairs * p) + 10)
+
+        while position < pairs:
+            gaps = np.random.geometric(p, expected)
+            chunk = position + np.cumsum(gaps)
+            chunks.append(chunk)
+            position = chunk[-1]
+
+        selected = np.concatenate(chunks)
+        selected = selected[selected < pairs]
+
+    src, dst = _pair_from_index(n, selected)
+    return CSRGraph.from_edges(n, src, dst)
+
+def _edge_keys(n, src, dst):
+    # Orientation-free integer key of an undirected edge
+    return np.minimum(src, dst).astype(np.int64) * n + np.maximum(src, dst)
+
+def _pair_from_index(n, index):
+    # Maps a row-major upper-triangle index to the pair (i, j) with i < j
+    index = index.astype(np.int64)
+    i = (n - 2 - np.floor(np.sqrt(-8 * index + 4 * n * (n - 1) - 7) / 2.0 - 0.5)).astype(np.int64)
+
+    # Correct floating point rounding at row boundaries
+    row_start = i * (2 * n - i - 1) // 2
+    i = np.where(index < row_start, i - 1, i)
+    row_start = i * (2 * n - i - 1) // 2
+    next_start = (i + 1) * (2 * n - i - 2) // 2
+    i = np.where(index >= next_start, i + 1, i)
+    row_start = i * (2 * n - i - 1) // 2
+
+    j = index - row_start + i + 1
+    return i.astype(np.int32), j.astype(np.int32)
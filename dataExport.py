@@ -1,4 +1,5 @@
 import csv
+import os
 from datetime import datetime
 
 def export_csv(data, headers, filename_prefix):
@@ -11,5 +12,22 @@ def export_csv(data, headers, filename_prefix):
 
     return filename
 
+def append_line(path, line, sync=False):
+    """ Appends line and a newline to a JSON lines file in one write. A torn last line left by a crash is
+    ended first, so the new line never joins it; readers skip the torn line as unparseable. """
+    data = (line + "\n").encode()
+
+    with open(path, "a+b") as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell():
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                data = b"\n" + data
+
+        file.write(data)
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+
 def timestamp():
     return datetime.now().strftime("%Y%m%d_%H%M%S")
\ No newline at end of file
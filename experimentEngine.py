@@ -0,0 +1,472 @@
+""" Experiment loops shared by the Tk GUI and the headless batch runner.
+Nothing here imports tkinter or matplotlib; progress is reported through an emit callback. """
+
+import math
+import time
+import numpy as np
+
+from kargerMinCut import KargerMinCut
+from quickSort import QuickSort
+from parallelRunner import ParallelRunner
+from trialKernels import MEASURES, get_oracle, seed_globals, measure_call, tracing
+from streamingStats import RunningStats
+from dataExport import export_csv
+from rawTrials import RawTrialWriter
+from inputDistributions import DISTRIBUTIONS, DISTINCT
+from quickSortTheory import expected_comparisons, comparison_distribution, DISTRIBUTION_LIMIT
+
+# Per-algorithm Monte Carlo setup: trial kernel, recorded metric, theoretical curve and export layout.
+# "extra" lists further kernel metrics exported as per-n means: (metric, column)
+ALGORITHMS = {
+    "Randomized Quick Sort": {
+        "kernel": "quick_sort",
+        "metric": "comparisons",
+        "tag": "quick_monte_carlo",
+        "theoretical": expected_comparisons,
+        "headers": ["input_size", "mean_comparisons", "variance"],
+        "extra": [("swaps", "mean_swaps")],
+        "prefix": "quick_sort_monte_carlo",
+        "min_n": 1
+    },
+    "Random Graph BFS": {
+        "kernel": "bfs",
+        "metric": "tree_height",
+        "tag": "bfs_monte_carlo",
+        "theoretical": lambda n: 2 * math.log(n),
+        "headers": ["input_size", "mean_tree_depth", "variance"],
+        "prefix": "bfs_monte_carlo",
+        "min_n": 5
+    },
+    "Karger Min-Cut": {
+        "kernel": "karger",
+        "metric": "success_probability",
+        "tag": "karger_monte_carlo",
+        "theoretical": lambda n: 2 / (n * (n - 1)),
+        "headers": ["input_size", "success_probability", "variance"],
+        "count": "graphs",
+        "extra": [("rejections", "mean_rejections")],
+        "prefix": "karger_monte_carlo",
+        "min_n": 2
+    },
+    "Karger-Stein Min-Cut": {
+        "kernel": "karger_stein",
+        "metric": "success_probability",
+        "tag": "karger_stein_monte_carlo",
+        "theoretical": lambda n: min(1.0, 1 / math.log2(n)),
+        "headers": ["input_size", "success_probability", "variance"],
+        "count": "graphs",
+        "extra": [("contractions", "mean_contractions"), ("rejections", "mean_rejections")],
+        "prefix": "karger_stein_monte_carlo",
+        "min_n": 2
+    }
+}
+
+GRAPH_TRIALS = 5  # Number of different graphs per n for the min-cut algorithms, the trials their counts refer to
+
+# Axis labels of metrics that can be selected instead of an algorithm's default one
+METRIC_LABELS = {
+    "runtime_ns": "Runtime (ns)",
+    "peak_bytes": "Peak Memory (bytes)",
+    "swaps": "Swaps",
+    "rejections": "Rejected Graph Draws",
+    "contractions": "Contractions"
+}
+
+def metric_choices(algorithm, mode="Monte Carlo"):
+    """ Metrics a run of algorithm can plot and export, its default first. Histograms of the min-cut
+    algorithms score runs on a single graph, so their per-graph extras are not available there. """
+    spec = ALGORITHMS[algorithm]
+    per_trial = mode == "Monte Carlo" or spec["kernel"] == "quick_sort"
+    extra = [metric for metric, _ in spec.get("extra", [])] if per_trial else []
+    return [spec["metric"]] + extra + list(MEASURES)
+
+def has_exact_theory(config):
+    # quickSortTheory's exact comparison counts describe Lomuto partitioning of distinct keys
+    return (config.algorithm == "Randomized Quick Sort" and config.metric in (None, "comparisons")
+            and config.partition == "lomuto" and config.distribution in DISTINCT)
+
+def _variant_suffix(config):
+    # Quick Sort files of the other partition schemes and input distributions are named after them
+    suffix = ""
+    if config.algorithm == "Randomized Quick Sort":
+        if config.partition != "lomuto":
+            suffix += f"_{config.partition}"
+        if config.distribution != "uniform":
+            suffix += f"_{config.distribution}"
+    return suffix
+
+class ExperimentConfig:
+    """ One experiment as described by the GUI controls or an Examples/*/config.txt file. """
+
+    # config.txt key -> attribute name
+    KEYS = {
+        "mode": "mode",
+        "algorithm": "algorithm",
+        "min (n)": "min_n",
+        "max (n)": "max_n",
+        "step": "step",
+        "trials (k)": "trials",
+        "workers": "workers",
+        "seed": "seed",
+        "karger engine": "karger_engine",
+        "graph backend": "graph_backend",
+        "graph sampling": "graph_sampling",
+        "sort engine": "sort_engine",
+        "partition": "partition",
+        "input distribution": "distribution",
+        "tolerance": "tolerance",
+        "max trials": "max_trials",
+        "metric": "metric"
+    }
+
+    INT_FIELDS = ("min_n", "max_n", "step", "trials", "workers", "seed", "max_trials")
+    FLOAT_FIELDS = ("tolerance",)
+
+    def __init__(self, mode="Monte Carlo", algorithm="Randomized Quick Sort", min_n=10, max_n=100, step=10,
+                 trials=50, workers=1, seed=None, karger_engine="union_find", graph_backend="csr",
+                 graph_sampling="rejection", tolerance=None, max_trials=None, metric=None, sort_engine="recursive",
+                 partition="lomuto", distribution="uniform"):
+        self.mode = mode
+        self.algorithm = algorithm
+        self.min_n = min_n
+        self.max_n = max_n
+        self.step = step
+        self.trials = trials
+        self.workers = workers
+        self.seed = seed
+        self.karger_engine = karger_engine
+        self.graph_backend = graph_backend
+        self.graph_sampling = graph_sampling
+        self.sort_engine = sort_engine
+        self.partition = partition
+        self.distribution = distribution
+
+        # Adaptive mode: relative CI half-width target and trial budget per n
+        self.tolerance = tolerance
+        self.max_trials = max_trials
+
+        # Metric to plot and export; None keeps the algorithm's own (see metric_choices)
+        self.metric = metric
+
+    @classmethod
+    def from_file(cls, path):
+        """ Parses the "Key - Value" lines of a config.txt file. Unknown keys raise ValueError. """
+        config = cls()
+
+        with open(path) as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+
+                key, separator, value = line.partition(" - ")
+                attribute = cls.KEYS.get(key.strip().lower())
+                if not separator or attribute is None:
+                    raise ValueError(f"{path}: cannot parse line '{line}'")
+
+                value = value.strip()
+                if attribute in cls.INT_FIELDS:
+                    value = int(value)
+                elif attribute in cls.FLOAT_FIELDS:
+                    value = float(value)
+                setattr(config, attribute, value)
+
+        return config
+
+    def n_values(self):
+        return list(range(self.min_n, self.max_n + 1, self.step))
+
+    def validate(self):
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {self.algorithm}")
+        if self.mode not in ("Monte Carlo", "Histogram"):
+            raise ValueError(f"Mode '{self.mode}' cannot run headless")
+
+        minimum = ALGORITHMS[self.algorithm]["min_n"]
+        if self.min_n < minimum:
+            raise ValueError(f"Minimum input value must be {minimum} or greater")
+
+        if self.sort_engine not in QuickSort.ENGINES:
+            raise ValueError(f"Unknown Quick Sort engine: {self.sort_engine}")
+        if self.partition not in QuickSort.PARTITIONS:
+            raise ValueError(f"Unknown partition scheme: {self.partition}")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown input distribution: {self.distribution}")
+        if self.algorithm == "Randomized Quick Sort" and self.sort_engine == "buffer" and self.partition != "lomuto":
+            raise ValueError("The buffer engine only implements Lomuto partitioning")
+
+        if self.metric is not None and self.metric not in metric_choices(self.algorithm, self.mode):
+            raise ValueError(f"Metric '{self.metric}' is not available for {self.algorithm} in {self.mode} mode")
+
+    def create_runner(self, seed=None):
+        # seed overrides the configured one, e.g. with the entropy of a run being resumed
+        return ParallelRunner(workers=self.workers, seed=self.seed if seed is None else seed)
+
+def run_monte_carlo(config, emit=None, should_stop=None, store=None, resume=False, raw=None, phases=None):
+    """ Runs a Monte Carlo sweep over config.n_values().
+    With config.tolerance set, each n keeps running rounds of trials until the 95% CI half-width of the mean
+    drops below tolerance * |mean| or config.max_trials is reached; otherwise exactly config.trials run.
+    For the min-cut algorithms a trial is one graph scored by config.trials runs, so rounds, max_trials and the
+    exported count (named "graphs") count graphs.
+    With an ExperimentStore, every finished n is appended to it; resume=True reuses the stored rows of an
+    identical configuration (and its seed, when none is configured) and only runs the missing n.
+    With a RawTrialWriter, every trial run here is also written to memory-mapped .npy columns.
+    emit receives (tag, n_values, empirical, theoretical, std_dev, trials) after every completed n, and with a
+    PhaseLog also its ("phases", ...) throughput and phase breakdown message.
+    Returns (rows, headers, prefix) ready for export_csv. """
+    config.validate()
+    spec = ALGORITHMS[config.algorithm]
+    emit = emit or (lambda message: None)
+
+    resume = resume and store is not None
+    runner = config.create_runner(store.resume_entropy(config) if resume else None)
+    n_values = config.n_values()
+    metric, metric_names, headers, theoretical, prefix = _layout(config, spec)
+
+    # n -> CSV row; rows of a resumed sweep start out as the stored ones
+    stored = store.completed(config, runner.entropy) if resume else {}
+    finished = {n: record["row"] for n, record in stored.items() if n in n_values and record["headers"] == headers}
+
+    positions = [position for position, n in enumerate(n_values) if n not in finished]
+    pending = [n_values[position] for position in positions]
+
+    if spec["kernel"] in ("karger", "karger_stein"):
+        # Each trial generates one graph and runs the algorithm k times on it
+        trials = GRAPH_TRIALS
+        params = {"k": config.trials, "engine": config.karger_engine, "sampling": config.graph_sampling}
+    else:
+        trials = config.trials
+        params = {"graph_backend": config.graph_backend, "sort_engine": config.sort_engine,
+                  "partition": config.partition, "distribution": config.distribution}
+
+    # Kernels only time their phases, or measure runtime / memory, when asked to
+    params["phases"] = phases is not None
+    params["measure"] = MEASURES.get(metric)
+
+    if raw is not None:
+        per_n = (config.max_trials or 10 * trials) if config.tolerance else trials
+        capacity = len(pending) * per_n
+        raw.open(prefix, capacity, metric_names, {
+            "mode": config.mode,
+            "algorithm": config.algorithm,
+            "entropy": runner.entropy,
+            "headers": headers
+        })
+
+    accumulators = {}
+
+    def record(n, metrics):
+        # Streams a block of trial results into the per-n accumulators
+        stats = accumulators.setdefault(n, {name: RunningStats() for name in metric_names})
+        if raw is not None:
+            raw.append(n, stats[metric].count, metrics)
+        if phases is not None:
+            phases.record(n, metrics)
+
+        for name in metric_names:
+            stats[name].update_batch(metrics[name])
+        return stats[metric]
+
+    def completed():
+        # Yields every n whose accumulators are final
+        if config.tolerance:
+            rounds = runner.run_adaptive(
+                spec["kernel"], pending, trials, config.max_trials or 10 * trials,
+                lambda n, metrics: record(n, metrics).converged(config.tolerance),
+                params, should_stop=should_stop, positions=positions
+            )
+            for n, _, done in rounds:
+                if done:
+                    yield n
+        else:
+            rounds = runner.run(spec["kernel"], pending, trials, params, should_stop=should_stop, positions=positions)
+            for n, metrics in rounds:
+                record(n, metrics)
+                yield n
+
+    def report():
+        # Plots every finished n so far, resumed ones included
+        done = sorted(finished)
+        emit((
+            spec["tag"],
+            done,
+            [finished[n][1] for n in done],
+            [theoretical(n) for n in done],
+            np.sqrt([finished[n][2] for n in done]),
+            [finished[n][3] for n in done]
+        ))
+
+    if finished:
+        report()
+
+    try:
+        for n in completed():
+            stats = accumulators.pop(n)
+            main = stats[metric]
+
+            finished[n] = [n, main.mean, main.variance, main.count] + [stats[name].mean for name in metric_names[1:]]
+            if store is not None:
+                store.append(config, runner.entropy, n, finished[n], headers, prefix)
+            if raw is not None:
+                raw.flush()
+
+            report()
+            if phases is not None:
+                emit(phases.finish(n, main.count))
+    finally:
+        if raw is not None:
+            raw.close()
+
+    rows = [finished[n] for n in sorted(finished)]
+    return rows, headers, prefix
+
+def _layout(config, spec):
+    """ (metric, metric names, CSV headers, theoretical curve, file prefix) of a sweep. The default metric
+    keeps the algorithm's own layout; another one becomes the main column, followed by the default metric
+    and the remaining extras, and has no theoretical curve. """
+    extra = spec.get("extra", [])
+    count = spec.get("count", "trials")
+    metric = config.metric or spec["metric"]
+    prefix = spec["prefix"] + _variant_suffix(config)
+
+    if metric == spec["metric"]:
+        names = [metric] + [name for name, _ in extra]
+        headers = spec["headers"] + [count] + [column for _, column in extra]
+        exact = spec["kernel"] != "quick_sort" or has_exact_theory(config)
+        return metric, names, headers, spec["theoretical"] if exact else lambda n: math.nan, prefix
+
+    others = [(spec["metric"], spec["headers"][1])] + [(name, column) for name, column in extra if name != metric]
+    names = [metric] + [name for name, _ in others]
+    headers = ["input_size", f"mean_{metric}", "variance", count] + [column for _, column in others]
+    return metric, names, headers, lambda n: math.nan, f"{prefix}_{metric}"
+
+def run_histogram(config, emit=None, should_stop=None, raw=None):
+    """ Runs k trials at the fixed input size config.max_n.
+    emit receives ("histogram", results, title, xlabel, exact), where exact is the exact distribution of
+    Quick Sort comparison counts (probabilities indexed by count) when known, else None.
+    Returns (rows, headers, prefix).
+    With a RawTrialWriter, the k values are also written to memory-mapped .npy columns. """
+    config.validate()
+    emit = emit or (lambda message: None)
+
+    n = config.max_n
+    k = config.trials
+    runner = config.create_runner()
+
+    # The alternatives to a histogram's own metric are the measured ones and Quick Sort's swaps
+    selected = config.metric if config.metric in metric_choices(config.algorithm, config.mode)[1:] else None
+    measure = MEASURES.get(selected)
+    exact = None
+
+    if config.algorithm == "Randomized Quick Sort":
+        metric = selected or "comparisons"
+        params = {"measure": measure, "sort_engine": config.sort_engine, "partition": config.partition,
+                  "distribution": config.distribution}
+        metrics = _single_n(runner, "quick_sort", n, k, params, should_stop)
+        name, xlabel = "Quick Sort", "Comparisons"
+
+        if selected is None and has_exact_theory(config) and n <= DISTRIBUTION_LIMIT:
+            exact = comparison_distribution(n)
+
+    elif config.algorithm == "Random Graph BFS":
+        metric = selected or "tree_height"
+        params = {"graph_backend": config.graph_backend, "measure": measure}
+        metrics = _single_n(runner, "bfs", n, k, params, should_stop)
+        name, xlabel = "BFS", "Tree Depth"
+
+    else:
+        # Min-cut histograms score k runs on one graph
+        seed = seed_globals(np.random.SeedSequence(runner.entropy))
+        start = time.perf_counter()
+
+        karger = KargerMinCut(config.karger_engine, config.graph_sampling)
+        G = karger.generate_graph(n)
+        true_cut = get_oracle().min_cut(G)
+
+        if config.algorithm == "Karger Min-Cut":
+            graph = karger.prepare(G)
+            run_one = lambda: karger.run_karger(graph)["cut_size"]
+            run_all = lambda: karger.run_karger_trials(graph, k)
+            name = "Karger"
+        else:
+            graph = karger.to_edge_arrays(G)
+            run_one = lambda: karger.run_karger_stein(graph)["cut_size"]
+            run_all = lambda: np.array([run_one() for _ in range(k)])
+            name = "Karger-Stein"
+
+        metric = selected or "success"
+        measured = []
+
+        if measure is None:
+            cuts = run_all()
+        else:
+            # A measured histogram needs one value per run, so the runs are measured one at a time
+            with tracing(measure):
+                results = [measure_call(measure, run_one) for _ in range(k)]
+            cuts = np.array([cut for cut, _ in results])
+            measured = [value for _, value in results]
+
+        # Runs share the graph, so each is charged an equal share of the total time
+        metrics = {
+            "success": (cuts == true_cut).astype(int).tolist(),
+            "seed": [seed] * k,
+            "wall_time": [(time.perf_counter() - start) / k] * k
+        }
+        if measure is not None:
+            metrics[metric] = measured
+        xlabel = "Success (1=correct, 0=incorrect)"
+
+    if selected:
+        xlabel = METRIC_LABELS[metric]
+
+    title = f"{name} {xlabel.split(' (')[0]} Distribution (n = {n})"
+    results = metrics.get(metric, [])
+    prefix = f"{config.algorithm.replace(' ', '_').lower()}_histogram{_variant_suffix(config)}"
+    if selected:
+        prefix += f"_{metric}"
+
+    if raw is not None and results:
+        raw.open(prefix, len(results), [metric], {
+            "mode": config.mode,
+            "algorithm": config.algorithm,
+            "entropy": runner.entropy,
+            "headers": ["value"]
+        })
+        raw.append(n, 0, metrics)
+        raw.close()
+
+    emit(("histogram", results, title, xlabel, exact))
+
+    rows = [[val] for val in results]
+    return rows, ["value"], prefix
+
+def run_experiment(config, emit=None, should_stop=None, output_prefix="", store=None, resume=False, raw=False,
+                   phases=None):
+    """ Runs the configured mode and exports the CSV, returning the file name.
+    Monte Carlo sweeps are checkpointed to store (an ExperimentStore) when one is given.
+    raw=True also keeps every trial in a <prefix>_<timestamp>_raw directory of .npy columns.
+    With a PhaseLog, Monte Carlo sweeps also time their phases; the breakdown is exported to
+    <prefix>_phases_<timestamp>.csv, whose name is left in phases.file. """
+    writer = RawTrialWriter(output_prefix) if raw else None
+
+    if config.mode == "Histogram":
+        rows, headers, prefix = run_histogram(config, emit, should_stop, writer)
+    else:
+        rows, headers, prefix = run_monte_carlo(config, emit, should_stop, store, resume, writer, phases)
+        if phases is not None:
+            phases.export(output_prefix + prefix)
+
+    return export_csv(rows, headers, output_prefix + prefix)
+
+def export_stored(config, store, output_prefix=""):
+    """ Exports the CSV of the latest stored run of config without recomputing anything. """
+    rows, headers, prefix = store.export_rows(config)
+    if not rows:
+        raise ValueError(f"No stored results for {config.algorithm} in {store.path}")
+
+    return export_csv(rows, headers, output_prefix + prefix)
+
+def _single_n(runner, kernel, n, k, params, should_stop):
+    for _, metrics in runner.run(kernel, [n], k, params, should_stop=should_stop):
+        return metrics
+    return {}
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from dataExport import append_line
+
+class ExperimentStore:
+    """ Append-only JSON lines file holding one durable record per completed input size.
+    Each record carries the configuration key, the seed entropy, the per-n aggregates (the CSV row) and the
+    export layout, so an interrupted sweep can be resumed and its CSV rebuilt without recomputation. """
+
+    # Settings that do not change results and are therefore left out of the configuration key
+    IGNORED_FIELDS = ("workers", "seed")
+
+    # Settings added after the store format -> their default; left out at the default, so older records keep their key
+    OPTIONAL_FIELDS = {"metric": None, "sort_engine": "recursive", "partition": "lomuto", "distribution": "uniform"}
+
+    # Algorithm -> generator of its inputs, added to the key so records made from differently generated inputs
+    # (Quick Sort inputs came from np.random.uniform before the SplitMix64 input pool) are never reused
+    INPUT_GENERATORS = {"Randomized Quick Sort": "splitmix64"}
+
+    def __init__(self, path="experiment_store.jsonl"):
+        self.path = path
+
+    def config_key(self, config):
+        fields = {
+            name: value for name, value in sorted(vars(config).items())
+            if name not in self.IGNORED_FIELDS and not (name in self.OPTIONAL_FIELDS and value == self.OPTIONAL_FIELDS[name])
+        }
+        if config.algorithm in self.INPUT_GENERATORS:
+            fields["input_generator"] = self.INPUT_GENERATORS[config.algorithm]
+        return hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+    def records(self, config, entropy=None):
+        """ Stored records of this configuration, optionally only those produced with the given seed entropy. """
+        if not os.path.exists(self.path):
+            return []
+
+        key = self.config_key(config)
+        found = []
+
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn line; every complete record around it is still valid
+                    continue
+
+                if record["config_key"] == key and (entropy is None or record["entropy"] == entropy):
+                    found.append(record)
+
+        return found
+
+    def resume_entropy(self, config):
+        """ Seed entropy to resume with: the configured seed, else the entropy of the latest stored run. """
+        if config.seed is not None:
+            return config.seed
+
+        found = self.records(config)
+        return found[-1]["entropy"] if found else None
+
+    def completed(self, config, entropy):
+        # n -> record for every input size already finished with this configuration and seed
+        return {record["n"]: record for record in self.records(config, entropy)}
+
+    def append(self, config, entropy, n, row, headers, prefix):
+        record = {
+            "config_key": self.config_key(config),
+            "config": vars(config),
+            "entropy": entropy,
+            "n": n,
+            "row": row,
+            "headers": headers,
+            "prefix": prefix,
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        }
+
+        # One write and an fsync per record. A crash mid-write leaves a torn last line, which append_line ends
+        # before the next record and records() skips, so only the input size in progress is lost
+        append_line(self.path, json.dumps(record, default=_to_builtin), sync=True)
+
+    def export_rows(self, config, entropy=None):
+        """ Rebuilds (rows, headers, prefix) for export_csv from stored records, sorted by n.
+        Uses the latest run of this configuration when entropy is not given. """
+        entropy = self.resume_entropy(config) if entropy is None else entropy
+        completed = self.completed(config, entropy)
+
+        if not completed:
+            return [], [], None
+
+        first = next(iter(completed.values()))
+        rows = [completed[n]["row"] for n in sorted(completed)]
+        return rows, first["headers"], first["prefix"]
+
+def _to_builtin(value):
+    # NumPy scalars in rows are stored as plain numbers
+    return value.item() if hasattr(value, "item") else str(value)
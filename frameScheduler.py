@@ -0,0 +1,96 @@
+import time
+
+class FrameScheduler:
+    """ Plays an animation from Tk after() callbacks instead of blocking sleeps.
+    frames is a generator that updates the animation state by one frame per next() and yields a value for
+    render(value), which puts the state on screen. Frames are due every 1 / (fps * speed) seconds; when
+    rendering falls behind, overdue frames are still advanced but not rendered (dropped, at most
+    max_skip in a row), so the animation keeps its pace. Between frames the Tk event loop is free, so
+    stop() and pause() take effect before the next frame. """
+
+    def __init__(self, root, frames, render, fps=20.0, on_finish=None, max_skip=50):
+        self.root = root
+        self.frames = frames
+        self.render = render
+        self.fps = fps
+        self.on_finish = on_finish
+        self.max_skip = max_skip
+
+        self.speed = 1.0
+        self.paused = False
+        self.finished = False
+
+        # Latest value yielded by frames
+        self.value = None
+        self.rendered = 0
+        self.dropped = 0
+
+        self.job = None
+        self.due = None
+
+    def start(self):
+        self.due = time.perf_counter()
+        self._schedule()
+
+    def pause(self):
+        self.paused = True
+        self._cancel()
+
+    def resume(self):
+        if self.paused and not self.finished:
+            self.paused = False
+            self.due = time.perf_counter()
+            self._schedule()
+
+    def set_speed(self, speed):
+        self.speed = max(speed, 1e-3)
+
+    def stop(self):
+        # Ends the animation where it is; the last rendered frame stays on screen
+        self._cancel()
+        self._finish()
+
+    def _tick(self):
+        self.job = None
+        if self.paused or self.finished:
+            return
+
+        interval = 1.0 / (self.fps * self.speed)
+
+        for skipped in range(self.max_skip + 1):
+            try:
+                self.value = next(self.frames)
+            except StopIteration:
+                self.render(self.value)
+                self._finish()
+                return
+
+            self.due += interval
+            if self.due > time.perf_counter():
+                break
+
+            if skipped == self.max_skip:
+                # Too far behind to catch up; continue from now instead of dropping frames forever
+                self.due = time.perf_counter()
+            else:
+                self.dropped += 1
+
+        self.render(self.value)
+        self.rendered += 1
+        self._schedule()
+
+    def _schedule(self):
+        delay = max(0.0, self.due - time.perf_counter())
+        self.job = self.root.after(int(delay * 1000), self._tick)
+
+    def _cancel(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def _finish(self):
+        if not self.finished:
+            self.finished = True
+            self.frames.close()
+            if self.on_finish:
+                self.on_finish(self)
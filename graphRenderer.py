@@ -0,0 +1,150 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+class GraphRenderer:
+    """ Draws a graph once and animates it by blitting.
+    Edges are a single LineCollection and nodes a single scatter collection, built from precomputed layout
+    positions and drawn in one full canvas draw. A frame then only paints the nodes and edges that changed
+    since the last frame onto the canvas through small overlay artists and blits the axes, so its cost
+    grows with the change, not with the graph. Changes that remove ink (merged nodes, hidden edges, thinner
+    edges) fall back to one full draw of the same static collections.
+    Node labels are drawn for small graphs only (label_limit). """
+
+    def __init__(self, canvas, ax, nodes, edges, pos, node_color="lightgray", edge_color="gray", label_limit=60):
+        self.canvas = canvas
+        self.ax = ax
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+        n = len(self.nodes)
+        self.pos = np.array([pos[node] for node in self.nodes], dtype=float).reshape(n, 2)
+        self.src = np.array([self.index[u] for u, _ in edges], dtype=np.int64)
+        self.dst = np.array([self.index[v] for _, v in edges], dtype=np.int64)
+
+        # owner[i] is the node currently standing in for node i (itself until it is merged away)
+        self.owner = np.arange(n)
+        self.edge_color = to_rgba(edge_color)
+
+        self.node_colors = np.tile(to_rgba(node_color), (n, 1))
+        self.edge_colors = np.tile(self.edge_color, (len(self.src), 1))
+        self.edge_widths = np.ones(len(self.src))
+
+        # Pending changes: painted by the next blit, or a full draw when stale
+        self.dirty_nodes = set()
+        self.dirty_edges = set()
+        self.stale = False
+
+        # Marker area shrinks with n so large graphs stay readable
+        size = 500 if n <= 40 else max(20, 20000 / n)
+
+        self.ax.set_axis_off()
+        self.edge_artist = LineCollection(self._segments(), colors=self.edge_colors, linewidths=self.edge_widths,
+                                          zorder=1)
+        self.ax.add_collection(self.edge_artist)
+        self.node_artist = self.ax.scatter(self.pos[:, 0], self.pos[:, 1], s=size, c=self.node_colors, zorder=2)
+
+        self.labels = []
+        if n <= label_limit:
+            self.labels = [
+                self.ax.text(x, y, str(node), ha="center", va="center", fontsize=8, zorder=3)
+                for node, (x, y) in zip(self.nodes, self.pos)
+            ]
+
+        # Overlays repaint only the changed edges and nodes; they never take part in a full draw
+        self.edge_overlay = LineCollection([], zorder=1, animated=True)
+        self.ax.add_collection(self.edge_overlay)
+        self.node_overlay = self.ax.scatter([], [], s=size, zorder=2, animated=True)
+
+        self.ax.update_datalim(self.pos)
+        self.ax.autoscale_view()
+        self.ax.margins(0.05)
+        self.canvas.draw()
+
+    def set_node_colors(self, nodes, color):
+        indices = [self.index[node] for node in nodes]
+        self.node_colors[indices] = to_rgba(color)
+        self.dirty_nodes.update(indices)
+
+    def set_edge_colors(self, edges, color=None, width=1.0):
+        # edges are indices into the edge list; color None restores the default colour
+        edges = np.asarray(edges, dtype=np.int64)
+        if np.any(self.edge_widths[edges] > width):
+            # A thinner line cannot cover the old one
+            self.stale = True
+
+        self.edge_colors[edges] = self.edge_color if color is None else to_rgba(color)
+        self.edge_widths[edges] = width
+        self.dirty_edges.update(edges.tolist())
+
+    def edges_between(self, u, v):
+        """ Indices of the edges currently joining the (possibly merged) nodes u and v. """
+        u, v = self.owner[self.index[u]], self.owner[self.index[v]]
+        owners_src, owners_dst = self.owner[self.src], self.owner[self.dst]
+        return np.flatnonzero(((owners_src == u) & (owners_dst == v)) | ((owners_src == v) & (owners_dst == u)))
+
+    def merge_nodes(self, survivor, absorbed):
+        """ Contracts absorbed into survivor: the absorbed node disappears, its edges are redrawn to the
+        survivor and edges that became self-loops are hidden. """
+        survivor, absorbed = self.owner[self.index[survivor]], self.owner[self.index[absorbed]]
+        self.owner[self.owner == absorbed] = survivor
+
+        self.node_colors[absorbed, 3] = 0.0
+        if self.labels:
+            self.labels[absorbed].set_visible(False)
+
+        touched = np.flatnonzero((self.owner[self.src] == survivor) | (self.owner[self.dst] == survivor))
+        self.edge_colors[touched] = self.edge_color
+        self.edge_widths[touched] = 1.0
+        self.edge_colors[touched[self.owner[self.src[touched]] == self.owner[self.dst[touched]]], 3] = 0.0
+
+        self.edge_artist.set_segments(self._segments())
+        self.stale = True
+
+    def blit(self):
+        """ Pushes pending changes to the screen. """
+        # The static collections always carry the full state, so any full draw (e.g. a resize) is correct
+        self.edge_artist.set_color(self.edge_colors)
+        self.edge_artist.set_linewidth(self.edge_widths)
+        self.node_artist.set_facecolor(self.node_colors)
+
+        if self.stale:
+            self.canvas.draw()
+        else:
+            self._paint_changes()
+
+        self.dirty_nodes.clear()
+        self.dirty_edges.clear()
+        self.stale = False
+
+    def _paint_changes(self):
+        edges = np.array(sorted(self.dirty_edges), dtype=np.int64)
+
+        # Endpoints of repainted edges are repainted too, so nodes stay on top of their edges
+        nodes = set(self.dirty_nodes)
+        if edges.size:
+            nodes.update(self.owner[self.src[edges]].tolist())
+            nodes.update(self.owner[self.dst[edges]].tolist())
+        nodes = np.array(sorted(nodes), dtype=np.int64)
+
+        if edges.size:
+            self.edge_overlay.set_segments(self._segments(edges))
+            self.edge_overlay.set_color(self.edge_colors[edges])
+            self.edge_overlay.set_linewidth(self.edge_widths[edges])
+            self.ax.draw_artist(self.edge_overlay)
+
+        if nodes.size:
+            self.node_overlay.set_offsets(self.pos[nodes])
+            self.node_overlay.set_facecolor(self.node_colors[nodes])
+            self.ax.draw_artist(self.node_overlay)
+
+            for i in nodes:
+                if self.labels and self.labels[i].get_visible():
+                    self.ax.draw_artist(self.labels[i])
+
+        self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+
+    def _segments(self, edges=slice(None)):
+        src, dst = self.owner[self.src[edges]], self.owner[self.dst[edges]]
+        return np.stack((self.pos[src], self.pos[dst]), axis=1).reshape(-1, 2, 2)
@@ -0,0 +1,114 @@
+import random
+import numpy as np
+import networkx as nx
+from scipy.sparse.csgraph import connected_components
+
+from csrGraph import CSRGraph, gnp_csr
+
+class SamplingError(RuntimeError):
+    """ Raised when rejection sampling exhausts its attempt budget without drawing a connected graph. """
+
+class ConnectedGraphSampler:
+    """ Samples connected Erdos-Renyi graphs and keeps rejection statistics.
+    Strategies:
+        - "rejection": redraws G(n, p) until connected; exactly G(n, p) conditioned on connectivity,
+          capped at max_attempts draws per sample
+        - "splice": one G(n, p) draw whose components are then joined by the minimal c - 1 random edges;
+          this is a different model ("gnp_spliced") but costs exactly one draw per sample """
+
+    STRATEGIES = ("rejection", "splice")
+
+    def __init__(self, p, strategy="rejection", max_attempts=10000, backend="networkx"):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy: {strategy}")
+
+        self.p = p
+        self.strategy = strategy
+        self.max_attempts = max_attempts
+        self.backend = backend
+
+        self.samples = 0
+        self.rejections = 0
+        self.spliced_edges = 0
+        self.last_rejections = 0
+
+    @property
+    def model(self):
+        return "gnp" if self.strategy == "rejection" else "gnp_spliced"
+
+    def sample(self, n, p=None):
+        """ Returns one connected graph on n nodes (NetworkX or CSRGraph, depending on backend). """
+        p = self.p if p is None else p
+        self.last_rejections = 0
+
+        if self.strategy == "splice":
+            G = self._splice(self._draw(n, p))
+            self.samples += 1
+            return G
+
+        for _ in range(self.max_attempts):
+            G = self._draw(n, p)
+            if self._is_connected(G):
+                self.samples += 1
+                return G
+
+            self.last_rejections += 1
+            self.rejections += 1
+
+        raise SamplingError(
+            f"No connected G(n={n}, p={p}) graph in {self.max_attempts} attempts; "
+            f"raise p or use the splice strategy"
+        )
+
+    def stats(self):
+        return {
+            "model": self.model,
+            "samples": self.samples,
+            "rejections": self.rejections,
+            "mean_rejections": self.rejections / self.samples if self.samples else 0.0,
+            "spliced_edges": self.spliced_edges
+        }
+
+    def _draw(self, n, p):
+        if self.backend == "csr":
+            return gnp_csr(n, p)
+        return nx.erdos_renyi_graph(n, p)
+
+    def _is_connected(self, G):
+        if isinstance(G, CSRGraph):
+            return G.is_connected()
+        return nx.is_connected(G)
+
+    def _splice(self, G):
+        # Links one random node of each component to one of the next component, in random component order
+        if isinstance(G, CSRGraph):
+            return self._splice_csr(G)
+
+        components = [list(c) for c in nx.connected_components(G)]
+        random.shuffle(components)
+
+        for left, right in zip(components, components[1:]):
+            G.add_edge(random.choice(left), random.choice(right))
+
+        self.spliced_edges += len(components) - 1
+        return G
+
+    def _splice_csr(self, G):
+        count, labels = connected_components(G.to_scipy(), directed=False)
+        if count == 1:
+            return G
+
+        # One random representative per component, joined as a chain in random order
+        order = np.random.permutation(G.n)
+        _, first = np.unique(labels[order], return_index=True)
+        representatives = order[first][np.random.permutation(count)]
+
+        src = np.repeat(np.arange(G.n, dtype=np.int32), np.diff(G.indptr))
+        keep = src < G.indices
+
+        self.spliced_edges += count - 1
+        return CSRGraph.from_edges(
+            G.n,
+            np.concatenate((src[keep], representatives[:-1].astype(np.int32))),
+            np.concatenate((G.indices[keep], representatives[1:].astype(np.int32)))
+        )
@@ -2,21 +2,52 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import numpy as np
-import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import networkx as nx
-from dataExport import export_csv
 
+import os
+import time
 import threading
 import queue
+import random
 
 # Import algorithms
-from quickSort import QuickSort
 from randomGraphBFS import RandomGraphBFS
 from kargerMinCut import KargerMinCut
+from quickSort import QuickSort
+from experimentEngine import ExperimentConfig, run_experiment, metric_choices, METRIC_LABELS
+from experimentStore import ExperimentStore
+from graphRenderer import GraphRenderer
+from barRenderer import BarRenderer
+from sortTrace import SortTrace
+from frameScheduler import FrameScheduler
+from livePlot import LivePlot
+from phaseTiming import PhaseLog, PHASES
+from complexityFit import fit_models
+from quickSortTheory import comparison_bands, z_scores
+from inputDistributions import InputPool, DISTRIBUTIONS
+from graphSampling import SamplingError
 
 class SimulationGUI:
+    # Monte Carlo message tag -> (title, x label, y label, theory label)
+    MONTE_CARLO_PLOTS = {
+        "quick_monte_carlo": ("Monte Carlo Simulation: Randomized Quick Sort", "Input Size (n)", "Comparisons",
+                              "Exact mean 2(n+1)H(n) - 4n"),
+        "bfs_monte_carlo": ("Monte Carlo Simulation: Random Graph BFS", "Number of Nodes (n)", "Tree Depth",
+                            "Theoretical 2 log(n)"),
+        "karger_monte_carlo": ("Monte Carlo Simulation: Karger's Min-Cut", "Number of Nodes (n)",
+                               "Probability of Finding Min-Cut", "Theoretical 2 / (n(n-1))"),
+        "karger_stein_monte_carlo": ("Monte Carlo Simulation: Karger-Stein Min-Cut", "Number of Nodes (n)",
+                                     "Probability of Finding Min-Cut", "Theoretical 1 / log2(n)")
+    }
+
+    # Most live plot redraws per second while a sweep is running
+    PLOT_RATE = 10.0
+
+    # Longest wait, in seconds, for the main thread to draw queued updates before the phase breakdown is exported
+    FLUSH_TIMEOUT = 10.0
+
     def __init__(self, root):
         self.root = root
         self.root.title("Stochastic Algorithm Simulation")
@@ -25,9 +56,30 @@ class SimulationGUI:
         self.stop_requested = False
         self.queue = queue.Queue()
 
+        # Recorded Quick Sort run being played back, and the renderer showing it
+        self.sort_trace = None
+        self.bar_renderer = None
+        self.sort_highlight = []
+
+        # Visualization currently playing, driven from Tk after() callbacks
+        self.animation = None
+
+        # Monte Carlo plot of the running sweep, updated in place, and the metric it shows (None = default)
+        self.live_plot = None
+        self.plot_metric = None
+
+        # Phase seconds of the running sweep, plus the main thread's plotting time, which is also added to the
+        # sweep's PhaseLog for the exported breakdown
+        self.phase_totals = {}
+        self.plot_seconds = 0.0
+        self.phase_log = None
+
         self.create_controls()
         self.create_plot()
 
+        # Polls the queue for updates from simulation threads for as long as the window is open
+        self.root.after(50, self.process_queue)
+
         self.root.protocol("WM_DELETE_WINDOW", self.exit_program)
 
     # UI controls
@@ -57,7 +109,7 @@ class SimulationGUI:
         ttk.Label(control_frame, text="Algorithm:").pack()
         self.algorithm_choice = ttk.Combobox(
             control_frame,
-            values=["Randomized Quick Sort", "Random Graph BFS", "Karger Min-Cut"],
+            values=["Randomized Quick Sort", "Random Graph BFS", "Karger Min-Cut", "Karger-Stein Min-Cut"],
             state="readonly"
         )
         self.algorithm_choice.current(0)
@@ -84,6 +136,99 @@ class SimulationGUI:
         self.k_trials.insert(0, "50")
         self.k_trials.pack()
 
+        vcmd_seed = (self.root.register(self.validate_seed), "%P")
+        vcmd_tolerance = (self.root.register(self.validate_tolerance), "%P")
+
+        # Adaptive trial counts: keep adding rounds of k trials (5 graphs for min-cut) until the 95% CI is tight enough
+        ttk.Label(control_frame, text="Rel. Tolerance (blank = fixed k):").pack()
+        self.tolerance = ttk.Entry(control_frame, validate="key", validatecommand=vcmd_tolerance)
+        self.tolerance.pack()
+
+        ttk.Label(control_frame, text="Max Trials (blank = 10 rounds):").pack()
+        self.max_trials = ttk.Entry(control_frame, validate="key", validatecommand=vcmd_seed)
+        self.max_trials.pack()
+
+        ttk.Label(control_frame, text="Workers:").pack()
+        self.workers = ttk.Entry(control_frame, validate="key", validatecommand=vcmd_pos)
+        self.workers.insert(0, str(os.cpu_count() or 1))
+        self.workers.pack()
+
+        ttk.Label(control_frame, text="Seed (blank = random):").pack()
+        self.seed = ttk.Entry(control_frame, validate="key", validatecommand=vcmd_seed)
+        self.seed.pack()
+
+        ttk.Label(control_frame, text="Graph Backend:").pack()
+        self.graph_backend = ttk.Combobox(
+            control_frame,
+            values=["csr", "networkx"],
+            state="readonly"
+        )
+        self.graph_backend.current(0)
+        self.graph_backend.pack()
+
+        ttk.Label(control_frame, text="Graph Sampling:").pack()
+        self.graph_sampling = ttk.Combobox(
+            control_frame,
+            values=["rejection", "splice"],
+            state="readonly"
+        )
+        self.graph_sampling.current(0)
+        self.graph_sampling.pack()
+
+        ttk.Label(control_frame, text="Karger Engine:").pack()
+        self.karger_engine = ttk.Combobox(
+            control_frame,
+            values=list(KargerMinCut.ENGINES),
+            state="readonly"
+        )
+        self.karger_engine.current(0)
+        self.karger_engine.pack()
+
+        ttk.Label(control_frame, text="Sort Engine:").pack()
+        self.sort_engine = ttk.Combobox(
+            control_frame,
+            values=list(QuickSort.ENGINES),
+            state="readonly"
+        )
+        self.sort_engine.current(0)
+        self.sort_engine.pack()
+
+        ttk.Label(control_frame, text="Partition:").pack()
+        self.partition = ttk.Combobox(
+            control_frame,
+            values=list(QuickSort.PARTITIONS),
+            state="readonly"
+        )
+        self.partition.current(0)
+        self.partition.pack()
+
+        ttk.Label(control_frame, text="Input Distribution:").pack()
+        self.distribution = ttk.Combobox(
+            control_frame,
+            values=list(DISTRIBUTIONS),
+            state="readonly"
+        )
+        self.distribution.current(0)
+        self.distribution.pack()
+
+        # Plotted and exported metric; the first choice is the algorithm's own
+        ttk.Label(control_frame, text="Metric:").pack()
+        self.metric = ttk.Combobox(control_frame, state="readonly")
+        self.metric.pack()
+        self.update_metric_choices()
+
+        # Monte Carlo sweeps are checkpointed per n; resuming skips the n already stored for the same settings
+        self.resume = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Resume stored run", variable=self.resume).pack(pady=5)
+
+        # Raw per-trial results go to a <prefix>_<timestamp>_raw directory of .npy columns next to the CSV
+        self.save_raw = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Save raw trials", variable=self.save_raw).pack()
+
+        # Per-phase timing of Monte Carlo trials, shown below and exported to a <prefix>_phases CSV
+        self.time_phases = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Time phases", variable=self.time_phases).pack()
+
         # BFS visualization legend
         self.bfs_legend = ttk.Label(
             control_frame,
@@ -92,6 +237,39 @@ class SimulationGUI:
         )
         self.mode_choice.bind("<<ComboboxSelected>>", lambda e: self.update_bfs_legend_visibility())
         self.algorithm_choice.bind("<<ComboboxSelected>>", lambda e: self.update_bfs_legend_visibility())
+        self.mode_choice.bind("<<ComboboxSelected>>", lambda e: self.update_metric_choices(), add="+")
+        self.algorithm_choice.bind("<<ComboboxSelected>>", lambda e: self.update_metric_choices(), add="+")
+
+        # Quick Sort playback: steps per frame, seek slider and single steps in both directions
+        ttk.Label(control_frame, text="Sort Speed (steps/frame):").pack()
+        self.sort_speed = tk.Scale(control_frame, from_=1, to=500, orient=tk.HORIZONTAL)
+        self.sort_speed.pack()
+
+        ttk.Label(control_frame, text="Sort Step:").pack()
+        self.sort_seek = tk.Scale(control_frame, from_=0, to=0, orient=tk.HORIZONTAL, command=self.seek_sort)
+        self.sort_seek.pack()
+
+        step_frame = ttk.Frame(control_frame)
+        step_frame.pack()
+        ttk.Button(step_frame, text="< Step", width=7, command=lambda: self.step_sort(-1)).pack(side=tk.LEFT)
+        ttk.Button(step_frame, text="Step >", width=7, command=lambda: self.step_sort(1)).pack(side=tk.LEFT)
+
+        self.sort_status = ttk.Label(control_frame, text="")
+        self.sort_status.pack()
+
+        # Visualization playback: speed multiplier over each animation's base frame rate, pause / resume
+        ttk.Label(control_frame, text="Animation Speed (x):").pack()
+        self.animation_speed = tk.Scale(control_frame, from_=0.25, to=8, resolution=0.25, orient=tk.HORIZONTAL,
+                                        command=self.set_animation_speed)
+        self.animation_speed.set(1)
+        self.animation_speed.pack()
+
+        self.pause_button = ttk.Button(
+            control_frame,
+            text="Pause",
+            command=self.toggle_pause
+        )
+        self.pause_button.pack(pady=5)
 
         # Run button
         self.run_button = ttk.Button(
@@ -109,6 +287,18 @@ class SimulationGUI:
         )
         self.stop_button.pack(pady=5)
 
+        # Live plot redraw time, which should stay flat as a sweep grows
+        self.plot_status = ttk.Label(control_frame, text="")
+        self.plot_status.pack()
+
+        # Throughput and phase breakdown of the running sweep
+        self.phase_status = ttk.Label(control_frame, text="", justify="left")
+        self.phase_status.pack()
+
+        # Growth models fitted to the sweep so far, best first
+        self.fit_status = ttk.Label(control_frame, text="", justify="left")
+        self.fit_status.pack()
+
     # Toggle BFS Legend
     def update_bfs_legend_visibility(self):
         algorithm = self.algorithm_choice.get()
@@ -121,15 +311,63 @@ class SimulationGUI:
             if self.bfs_legend.winfo_ismapped():
                 self.bfs_legend.pack_forget()
 
+    def update_metric_choices(self):
+        # Offers the metrics of the selected algorithm and mode, keeping the current choice when possible
+        mode = self.mode_choice.get()
+        choices = metric_choices(self.algorithm_choice.get(), "Histogram" if mode == "Histogram" else "Monte Carlo")
+
+        current = self.metric.get()
+        self.metric.configure(values=choices)
+        self.metric.current(choices.index(current) if current in choices else 0)
+
+    def selected_metric(self):
+        # None when the algorithm's own metric is selected
+        metric = self.metric.get()
+        return None if metric == self.metric.cget("values")[0] else metric
+
     # Stop sim
     def stop_simulation(self):
         # Sets stop flag to True. All loops check this flag to safely exit early
         self.stop_requested = True
+        self.stop_animation()
 
     def exit_program(self):
         # Closes the application window
+        self.stop_animation()
         self.root.destroy()
 
+    # Animation playback
+    def start_animation(self, frames, render, fps):
+        """ Plays frames through a FrameScheduler at fps times the speed control, replacing any running
+        animation. The GUI stays responsive in between frames, so Stop and Pause act before the next one. """
+        self.stop_animation()
+
+        self.animation = FrameScheduler(self.root, frames, render, fps=fps,
+                                        on_finish=lambda animation: self.pause_button.config(text="Pause"))
+        self.animation.set_speed(float(self.animation_speed.get()))
+        self.animation.start()
+
+    def stop_animation(self):
+        if self.animation is not None:
+            self.animation.stop()
+            self.animation = None
+
+    def set_animation_speed(self, speed):
+        if self.animation is not None:
+            self.animation.set_speed(float(speed))
+
+    def toggle_pause(self):
+        animation = self.animation
+        if animation is None or animation.finished:
+            return
+
+        if animation.paused:
+            animation.resume()
+            self.pause_button.config(text="Pause")
+        else:
+            animation.pause()
+            self.pause_button.config(text="Resume")
+
     # Plot setup
     def create_plot(self):
         # Creates matplotlib figure embedded inside Tkinter
@@ -143,6 +381,14 @@ class SimulationGUI:
             return True
         return value.isdigit() and int(value) > 0
 
+    def validate_seed(self, value):
+        # Seed may be blank or any non-negative integer
+        return value == "" or value.isdigit()
+
+    def validate_tolerance(self, value):
+        # Tolerance may be blank or a non-negative decimal such as 0.01
+        return value == "" or value.replace(".", "", 1).isdigit()
+
     def validate_karger_n(self, value):
         # Karger requires n >= 2
         if value == "":
@@ -157,104 +403,47 @@ class SimulationGUI:
         n = int(self.min_n.get())
         p = 0.1
 
-        if n > 40:
-            print("Visualization limited to n <= 40")
-            return
-
         bfs_sim = RandomGraphBFS(p)
         G = bfs_sim.generate_connected_graph(n)
 
         pos = nx.spring_layout(G, seed=42)
 
+        # The graph is drawn once; each step below only recolours nodes
+        renderer = GraphRenderer(self.canvas, self.ax, G.nodes(), G.edges(), pos)
+
         visited = set()
         queue = [0]
 
         visited.add(0)
 
-        # Track node colors
-        node_colors = {node: "lightgray" for node in G.nodes()}
+        def frames():
+            # One traversal step per frame; yields the node being expanded
+            while queue:
+                current = queue.pop(0)
 
-        while queue:
-            if self.stop_requested:
-                break
+                # Current node becomes RED
+                renderer.set_node_colors([current], "red")
+                yield current
 
-            current = queue.pop(0)
+                # Collect ALL neighbors first
+                new_neighbors = []
 
-            # Current node becomes RED
-            node_colors[current] = "red"
+                for neighbor in G.neighbors(current):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append(neighbor)
+                        new_neighbors.append(neighbor)
 
-            self.ax.clear()
-            nx.draw(
-                G,
-                pos,
-                ax=self.ax,
-                node_color=[node_colors[n] for n in G.nodes()],
-                with_labels=True,
-                font_size=8,
-                node_size=500
-            )
-            self.bfs_legend.config(text=f"""
-            Red = Current
-            Orange = Frontier
-            Blue = Visited
+                # Highlight them simultaneously (ORANGE)
+                renderer.set_node_colors(new_neighbors, "orange")
+                yield current
 
-            Current Node: {current}
-            Queue Size: {len(queue)}
-            Visited: {len(visited)}
-            """)
-            self.canvas.draw()
-            self.root.update()
-            self.root.after(500)
-
-            # Collect ALL neighbors first
-            new_neighbors = []
-
-            for neighbor in G.neighbors(current):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-                    new_neighbors.append(neighbor)
-
-            # Highlight them simultaneously (ORANGE)
-            for node in new_neighbors:
-                node_colors[node] = "orange"
-
-            self.ax.clear()
-            nx.draw(
-                G,
-                pos,
-                ax=self.ax,
-                node_color=[node_colors[n] for n in G.nodes()],
-                with_labels=True,
-                font_size=8,
-                node_size=500
-            )
-            self.bfs_legend.config(text=f"""
-            Red = Current
-            Orange = Frontier
-            Blue = Visited
+                # Mark current node as fully visited (BLUE)
+                renderer.set_node_colors([current], "blue")
+                yield current
 
-            Current Node: {current}
-            Queue Size: {len(queue)}
-            Visited: {len(visited)}
-            """)
-            self.canvas.draw()
-            self.root.update()
-            self.root.after(500)
-
-            # Mark current node as fully visited (BLUE)
-            node_colors[current] = "blue"
-
-            self.ax.clear()
-            nx.draw(
-                G,
-                pos,
-                ax=self.ax,
-                node_color=[node_colors[n] for n in G.nodes()],
-                with_labels=True,
-                font_size=8,
-                node_size=500
-            )
+        def render(current):
+            renderer.blit()
             self.bfs_legend.config(text=f"""
             Red = Current
             Orange = Frontier
@@ -264,446 +453,222 @@ class SimulationGUI:
             Queue Size: {len(queue)}
             Visited: {len(visited)}
             """)
-            self.canvas.draw()
-            self.root.update()
-            self.root.after(500)
-
-    # Monte Carlo mode
-    def run_quick_monte_carlo(self):
-        """ Performs Monte Carlo simulation of Randomized Quick Sort. For each input size n:
-            - Run k randomized trials
-            - Compute mean comparison count
-            - Plot empirical vs theoretical O(n log n) """
-        min_n = int(self.min_n.get())
-        max_n = int(self.max_n.get())
-        step = int(self.step.get())
-        k = int(self.k_trials.get())
-
-        n_values = list(range(min_n, max_n + 1, step))
-
-        empirical = []
-        theoretical = []
-        variance = []
-
-        for n in n_values:
-
-            if self.stop_requested:
-                break
-
-            algorithm = QuickSort()
-            results = []
-
-            for _ in range(k):
-                arr = np.random.uniform(0, 1, n)
-                metrics = algorithm.sort(arr)
-                results.append(metrics["comparisons"])
-
-            mean_val = np.mean(results)
-            var_val = np.var(results, ddof=1)
-
-            empirical.append(mean_val)
-            variance.append(var_val)
-            theoretical.append(n * math.log2(n))
-            std_dev = np.sqrt(variance[:len(empirical)])
-
-            self.queue.put((
-                "quick_monte_carlo",
-                n_values[:len(empirical)],
-                empirical.copy(),
-                theoretical.copy(),
-                std_dev.copy()
-            ))
-
-        # Export data
-        rows = [
-            [n, empirical[i], variance[i]]
-            for i, n in enumerate(n_values[:len(empirical)])
-        ]
-
-        file = export_csv(
-            rows,
-            ["input_size", "mean_comparisons", "variance"],
-            "quick_sort_monte_carlo"
-        )
-        messagebox.showinfo("Export Successful", f"Saved to {file}")
-
-    def run_bfs_monte_carlo(self):
-        """ Monte Carlo simulation for Random Graph BFS.
-        For each input size n:
-            - Generate k random connected graphs
-            - Run BFS
-            - Record max tree depth
-            - Plot empirical mean vs theoretical 2 * log(n) """
-        min_n = int(self.min_n.get())
-        max_n = int(self.max_n.get())
-        step = int(self.step.get())
-        k = int(self.k_trials.get())
-
-        if min_n < 5:
-            print("Input Error: Minimum input value must be 5 or greater")
-            return
 
-        n_values = list(range(min_n, max_n + 1, step))
-
-        empirical = []
-        theoretical = []
-        variance = []
-
-        for n in n_values:
-            if self.stop_requested:
-                break
-
-            bfs_sim = RandomGraphBFS()
-            results = []
-
-            for _ in range(k):
-                G = nx.connected_watts_strogatz_graph(n, k=4, p=0.1)
-                metrics = bfs_sim.run_bfs(G)
-                results.append(metrics["tree_height"])
-
-            mean_val = np.mean(results)
-            var_val = np.var(results, ddof=1)
-
-            empirical.append(mean_val)
-            variance.append(var_val)
-            theoretical.append(2 * math.log(n))
-            std_dev = np.sqrt(variance[:len(empirical)])
-
-            self.queue.put((
-                "bfs_monte_carlo",
-                n_values[:len(empirical)],
-                empirical.copy(),
-                theoretical.copy(),
-                std_dev.copy()
-            ))
-
-        # Export data
-        rows = [
-            [n, empirical[i], variance[i]]
-            for i, n in enumerate(n_values[:len(empirical)])
-        ]
-
-        file = export_csv(
-            rows,
-            ["input_size", "mean_tree_depth", "variance"],
-            "bfs_monte_carlo"
+        self.start_animation(frames(), render, fps=2)
+
+    # Monte Carlo and Histogram modes
+    def experiment_config(self, algorithm_name, mode):
+        # Collects the control values into the config shared with the headless batch runner
+        return ExperimentConfig(
+            mode=mode,
+            algorithm=algorithm_name,
+            min_n=int(self.min_n.get()),
+            max_n=int(self.max_n.get()),
+            step=int(self.step.get()),
+            trials=int(self.k_trials.get()),
+            workers=int(self.workers.get() or 1),
+            seed=int(self.seed.get()) if self.seed.get() else None,
+            karger_engine=self.karger_engine.get(),
+            graph_backend=self.graph_backend.get(),
+            graph_sampling=self.graph_sampling.get(),
+            tolerance=float(self.tolerance.get()) if self.tolerance.get() else None,
+            max_trials=int(self.max_trials.get()) if self.max_trials.get() else None,
+            metric=self.selected_metric(),
+            sort_engine=self.sort_engine.get(),
+            partition=self.partition.get(),
+            distribution=self.distribution.get()
         )
-        messagebox.showinfo("Export Successful", f"Saved to {file}")
-
-    def run_karger_monte_carlo(self):
-        min_n = int(self.min_n.get())
-        max_n = int(self.max_n.get())
-        step = int(self.step.get())
-        k = int(self.k_trials.get())
 
-        n_values = list(range(min_n, max_n + 1, step))
+    def run_experiment(self, algorithm_name, mode):
+        """ Runs a Monte Carlo sweep or a histogram on the shared experiment engine.
+        Every update is sent to the main thread through self.queue for plotting, then the data is exported. """
+        config = self.experiment_config(algorithm_name, mode)
+        phases = PhaseLog(flush=self.flush_plot) if self.time_phases.get() else None
+        self.phase_log = phases
 
-        empirical = []
-        theoretical = []
-        variance = []
-
-        karger = KargerMinCut()
-
-        graph_trials = 5  # Number of different graphs per n
-
-        for n in n_values:
-            if self.stop_requested:
-                break
-
-            probabilities = []
-
-            for _ in range(graph_trials):
-                # Generate one graph
-                G = karger.generate_graph(n)
-
-                # Compute true min-cut once per graph
-                true_cut = len(nx.minimum_edge_cut(G))
-
-                success_count = 0
-
-                # Run Karger multiple times on same graph
-                for _ in range(k):
-                    result = karger.run_karger(G)
-
-                    if result["cut_size"] == true_cut:
-                        success_count += 1
-
-                prob = success_count / k
-                probabilities.append(prob)
-
-            # Average across graphs
-            mean_prob = np.mean(probabilities)
-            var_val = np.var(probabilities, ddof=1)
-
-            empirical.append(mean_prob)
-            variance.append(var_val)
-            theoretical.append(2 / (n * (n - 1)))
-
-            std_dev = np.sqrt(variance[:len(empirical)])
-
-            # Send to main thread for plotting
-            self.queue.put((
-                "karger_monte_carlo",
-                n_values[:len(empirical)],
-                empirical.copy(),
-                theoretical.copy(),
-                std_dev.copy()
-            ))
-
-        # Export data
-        rows = [
-            [n, empirical[i], variance[i]]
-            for i, n in enumerate(n_values[:len(empirical)])
-        ]
+        try:
+            file = run_experiment(
+                config,
+                emit=self.queue.put,
+                should_stop=lambda: self.stop_requested,
+                store=ExperimentStore(),
+                resume=self.resume.get(),
+                raw=self.save_raw.get(),
+                phases=phases
+            )
+        except ValueError as e:
+            print(f"Input Error: {e}")
+            return
+        except SamplingError as e:
+            print(f"Sampling Error: {e}")
+            return
 
-        file = export_csv(
-            rows,
-            ["input_size", "success_probability", "variance"],
-            "karger_monte_carlo"
-        )
+        if phases is not None and phases.file:
+            file += f"\nPhase breakdown saved to {phases.file}"
         messagebox.showinfo("Export Successful", f"Saved to {file}")
 
     def visualize_karger(self):
         n = int(self.min_n.get())
 
-        if n > 25:
-            print("Visualization limited to n <= 25")
-            return
-
         karger = KargerMinCut()
         G = karger.generate_graph(n)
 
         pos = nx.spring_layout(G, seed=42)
 
-        generator = karger.contraction_generator(G)
-
-        for state, edge in generator:
-            if self.stop_requested:
-                break
+        self.ax.set_title(f"Karger's Min-Cut Contraction ({G.number_of_edges()} edges)")
+        renderer = GraphRenderer(self.canvas, self.ax, G.nodes(), G.edges(), pos, node_color="lightblue")
 
-            self.ax.clear()
+        def frames():
+            # Merge events only; the drawing is updated in place instead of redrawing a copied graph
+            for absorbed, survivor, self_loops, edges in karger.contraction_generator(G):
+                # Highlight the nodes that will be merged and the parallel edges between them
+                renderer.set_node_colors([absorbed, survivor], "red")
+                renderer.set_edge_colors(renderer.edges_between(survivor, absorbed), "red", width=3)
+                yield
 
-            # Default node colors
-            node_colors = ["lightblue" for _ in state.nodes()]
+                # The merge is shown together with the next highlight
+                renderer.set_node_colors([survivor], "lightblue")
+                renderer.merge_nodes(survivor, absorbed)
+                self.ax.set_title(f"Karger's Min-Cut Contraction ({edges} edges, {self_loops} self-loops removed)")
 
-            # Highlight nodes that will be merged
-            if edge is not None:
-                u, v = edge
-
-                node_colors = [
-                    "red" if node == u or node == v else "lightblue"
-                    for node in state.nodes()
-                ]
-
-            nx.draw(
-                state,
-                pos,
-                ax=self.ax,
-                node_color=node_colors,
-                edge_color="gray",
-                with_labels=True,
-                node_size=500
-            )
-
-            # Highlight the edge being contracted
-            if edge is not None and state.has_edge(*edge):
-                nx.draw_networkx_edges(
-                    state,
-                    pos,
-                    edgelist=[edge],
-                    edge_color="red",
-                    width=3,
-                    ax=self.ax
-                )
-            self.ax.set_title("Karger's Min-Cut Contraction")
-            self.canvas.draw()
-            self.root.update()
-            self.root.after(800)
+        self.start_animation(frames(), lambda _: renderer.blit(), fps=1.25)
 
     # Sort visualization mode
     def visualize_sort(self):
-        # Animates a single randomized Quick Sort trial. Highlights currently active elements during swaps.
+        # Records a single randomized Quick Sort trial as a compact trace, then plays it back. Highlights the
+        # elements of the current step; the playback controls can seek or step through the trace at any time.
         n = int(self.max_n.get())
-        arr = np.random.randint(1, 100, n)
+        distribution = self.distribution.get()
 
-        self.ax.clear()
-        bars = self.ax.bar(range(len(arr)), arr)
+        # Bar heights 1..99, like integer keys; uniform inputs repeat some of them. nearly_sorted values reach
+        # 1 + NEARLY_SORTED_JITTER, so its top bars are clipped to 99
+        values = InputPool(distribution).fill(n, [random.getrandbits(64)])[0]
+        arr = np.minimum(np.floor(values * 99).astype(int) + 1, 99)
 
-        self.ax.set_title("Randomized Quick Sort")
+        partition = self.partition.get()
+        self.ax.set_title(f"Randomized Quick Sort ({partition.replace('_', ' ')} partition, "
+                          f"{distribution.replace('_', ' ')} input)")
         self.ax.set_xlabel("Index")
         self.ax.set_ylabel("Value")
 
-        self.canvas.draw()
-        self.root.update()
-
-        generator = QuickSort().sort_generator(arr)
+        self.sort_trace = SortTrace.record(arr, QuickSort(partition=partition))
+        self.bar_renderer = BarRenderer(self.canvas, self.ax, arr)
+        self.sort_highlight = []
 
-        for state, highlight in generator:
-            if self.stop_requested:
-                break
-            for index, (bar, height) in enumerate(zip(bars, state)):
-                bar.set_height(height)
+        self.sort_seek.configure(to=len(self.sort_trace))
+        self.seek_sort(0)
 
-                # Highlight active bars
-                if index in highlight:
-                    bar.set_color("red")
-                else:
-                    bar.set_color("lightblue")
+        trace = self.sort_trace
 
-            self.canvas.draw()
-            self.root.update()
-            self.root.after(50)  # Animation speed (ms)
+        def frames():
+            # Reads the position every frame, so seeking or stepping during playback continues from there
+            while trace.position < len(trace):
+                self.advance_sort(trace.position + self.sort_speed.get())
+                yield
 
-    # Runs a histogram simulation for the selected algorithm at a fixed n
-    def run_histogram(self):
-        n = int(self.max_n.get())  # use max_n as fixed input size
-        k = int(self.k_trials.get())
+        self.start_animation(frames(), lambda _: self.show_sort(), fps=20)
 
-        algorithm_name = self.algorithm_choice.get()
-
-        results = []
+    def seek_sort(self, step):
+        # Moves the recorded trace to step; only bars whose value or highlight changed are redrawn
+        if self.sort_trace is None:
+            return
 
-        # Quick Sort Histogram
-        if algorithm_name == "Randomized Quick Sort":
-            algorithm = QuickSort()
+        self.advance_sort(step)
+        self.show_sort()
 
-            for _ in range(k):
-                arr = np.random.uniform(0, 1, n)
-                metrics = algorithm.sort(arr)
-                results.append(metrics["comparisons"])
+    def advance_sort(self, step):
+        # Updates the trace and the pending bar changes without drawing them
+        trace = self.sort_trace
 
-            title = f"Quick Sort Comparisons Distribution (n = {n})"
-            xlabel = "Comparisons"
+        changed = trace.seek(int(float(step)))
+        self.bar_renderer.set_heights(changed, trace.array[changed])
 
-        # BFS Histogram
-        elif algorithm_name == "Random Graph BFS":
-            bfs_sim = RandomGraphBFS()
+        self.bar_renderer.set_colors(self.sort_highlight)
+        self.sort_highlight = trace.highlight()
+        self.bar_renderer.set_colors(self.sort_highlight, "red")
 
-            for _ in range(k):
-                G = nx.connected_watts_strogatz_graph(n, k=4, p=0.1)
-                metrics = bfs_sim.run_bfs(G)
-                results.append(metrics["tree_height"])
+    def show_sort(self):
+        trace = self.sort_trace
+        if trace is None:
+            return
 
-            title = f"BFS Tree Depth Distribution (n = {n})"
-            xlabel = "Tree Depth"
+        self.bar_renderer.blit()
 
-        # Karger Histogram
-        elif algorithm_name == "Karger Min-Cut":
-            karger = KargerMinCut()
-            G = karger.generate_graph(n)
-            true_cut = len(nx.minimum_edge_cut(G))
+        comparisons, swaps = trace.counts()
+        self.sort_status.config(text=f"Step {trace.position} / {len(trace)}\n"
+                                     f"Comparisons: {comparisons}  Swaps: {swaps}")
+        self.sort_seek.set(trace.position)
 
-            for _ in range(k):
-                result = karger.run_karger(G)
-                results.append(1 if result["cut_size"] == true_cut else 0)
+    def step_sort(self, delta):
+        if self.sort_trace is not None:
+            self.seek_sort(self.sort_trace.position + delta)
 
-            title = f"Karger Success Distribution (n = {n})"
-            xlabel = "Success (1=correct, 0=incorrect)"
+    def process_queue(self):
+        try:
+            items = []
+            while not self.queue.empty():
+                items.append(self.queue.get())
 
-        self.ax.set_xlabel(xlabel)
-        self.ax.set_ylabel("Frequency")
+            # Monte Carlo messages carry every point so far, so only the latest one of each tag is plotted;
+            # the phases messages queued between them do not count
+            latest = {item[0]: i for i, item in enumerate(items) if item[0] in self.MONTE_CARLO_PLOTS}
 
-        self.queue.put(("histogram", results, title, xlabel))
+            for i, item in enumerate(items):
+                tag = item[0]
 
-        # Export data
-        rows = [[val] for val in results]
+                if tag == "phases":
+                    self.show_phases(item)
+                    continue
 
-        file = export_csv(
-            rows,
-            ["value"],
-            f"{algorithm_name.replace(' ', '_').lower()}_histogram"
-        )
-        messagebox.showinfo("Export Successful", f"Saved to {file}")
+                if tag in self.MONTE_CARLO_PLOTS:
+                    if latest[tag] == i:
+                        start = time.perf_counter()
+                        self.plot_monte_carlo(item)
+                        self.add_plot_time(time.perf_counter() - start)
+                    continue
 
-    def process_queue(self):
-        try:
-            while not self.queue.empty():
-                item = self.queue.get()
-                tag = item[0]
+                # The sweep thread waits for this before exporting the phase breakdown
+                if tag == "flush_plot":
+                    if self.live_plot is not None:
+                        self.live_plot.flush()
+                    item[1].set()
+                    continue
 
                 # Clear figure for fresh plot
-                self.fig.clf()
-                self.ax = self.fig.add_subplot(111)
-
-                # Quick Sort Monte Carlo
-                if tag == "quick_monte_carlo":
-                    _, x, empirical, theoretical, std_dev = item
-
-                    self.ax.errorbar(
-                        x, empirical,
-                        yerr=std_dev,
-                        fmt='o-',
-                        capsize=4,
-                        label="Empirical Mean + Std Dev"
-                    )
-                    self.ax.plot(x, theoretical, label="Theoretical n log n")
-
-                    self.ax.set_xlabel("Input Size (n)")
-                    self.ax.set_ylabel("Comparisons")
-                    self.ax.set_title("Monte Carlo Simulation: Randomized Quick Sort")
-                    self.ax.legend()
-
-                # BFS Monte Carlo
-                elif tag == "bfs_monte_carlo":
-                    _, x, empirical, theoretical, std_dev = item
-
-                    self.ax.errorbar(
-                        x, empirical,
-                        yerr=std_dev,
-                        fmt='o-',
-                        capsize=4,
-                        label="Empirical Mean + Std Dev"
-                    )
-                    self.ax.plot(x, theoretical, label="Theoretical 2 log(n)")
-
-                    self.ax.set_xlabel("Number of Nodes (n)")
-                    self.ax.set_ylabel("Tree Depth")
-                    self.ax.set_title("Monte Carlo Simulation: Random Graph BFS")
-                    self.ax.legend()
-
-                # Karger Monte Carlo
-                elif tag == "karger_monte_carlo":
-                    _, x, empirical, theoretical, std_dev = item
-
-                    self.ax.errorbar(
-                        x, empirical,
-                        yerr=std_dev,
-                        fmt='o-',
-                        capsize=4,
-                        label="Empirical Mean + Std Dev"
-                    )
-                    self.ax.plot(x, theoretical, label="Theoretical 2 / (n(n-1))")
-
-                    self.ax.set_xlabel("Number of Nodes (n)")
-                    self.ax.set_ylabel("Probability of Finding Min-Cut")
-                    self.ax.set_title("Monte Carlo Simulation: Karger's Min-Cut")
-                    self.ax.legend()
+                self.new_figure()
 
                 # Histogram
-                elif tag == "histogram":
-                    _, results, title, xlabel = item
+                if tag == "histogram":
+                    _, results, title, xlabel, exact = item
+
+                    _, edges, _ = self.ax.hist(results, bins=20, label="Simulated")
 
-                    self.ax.hist(results, bins=20)
+                    # Expected frequency of each bin under the exact distribution (last bin includes its right edge)
+                    if exact is not None:
+                        cumulative = np.concatenate(([0.0], np.cumsum(exact)))
+                        bounds = np.searchsorted(np.arange(len(exact)), edges, side="left")
+                        bounds[-1] = np.searchsorted(np.arange(len(exact)), edges[-1], side="right")
+                        expected = np.diff(cumulative[bounds]) * len(results)
+
+                        self.ax.plot((edges[:-1] + edges[1:]) / 2, expected, "o-", color="C1",
+                                     label="Exact distribution")
+                        self.ax.legend()
 
                     self.ax.set_title(title)
                     self.ax.set_xlabel(xlabel)
                     self.ax.set_ylabel("Frequency")
 
+                    self.canvas.draw()
+
                 # Visualization
                 elif tag == "visual_sort":
                     self.visualize_sort()
-                    continue
 
                 elif tag == "visual_bfs":
                     self.visualize_and_run_bfs()
-                    continue
 
                 elif tag == "visual_karger":
                     self.visualize_karger()
-                    continue
-
-                # Draw updated plot
-                self.canvas.draw()
 
         except Exception as e:
             print("Queue error:", e)
@@ -711,36 +676,115 @@ class SimulationGUI:
         # Keep polling queue
         self.root.after(50, self.process_queue)
 
-    def _run_simulation_thread(self, algorithm_name, mode):
-        if algorithm_name == "Random Graph BFS":
-            if mode == "Monte Carlo":
-                self.run_bfs_monte_carlo()
-            elif mode == "Histogram":
-                self.run_histogram()
-            else:
-                self.queue.put(("visual_bfs", None))
-            return
+    def new_figure(self):
+        # Clears the figure and ends whatever was drawn on it
+        self.fig.clf()
+        self.ax = self.fig.add_subplot(111)
+        self.stop_animation()
+        self.close_live_plot()
+        self.sort_trace = None
+
+    def plot_monte_carlo(self, item):
+        # The first message of a sweep sets up the plot; later ones only replace its data
+        tag, x, empirical, theoretical, std_dev, trials = item
+
+        if self.live_plot is None:
+            title, xlabel, ylabel, theory_label = self.MONTE_CARLO_PLOTS[tag]
+
+            if self.plot_metric:
+                ylabel = METRIC_LABELS.get(self.plot_metric, self.plot_metric)
+
+            # Other metrics than the algorithm's own, and Quick Sort's other partition schemes, have no theory
+            if not np.isfinite(theoretical).any():
+                theory_label = None
+
+            # Quick Sort comparison counts have an exact variance, so the plot shows where the means belong
+            band_label = "95% band of the mean" if tag == "quick_monte_carlo" and theory_label else None
+
+            self.new_figure()
+            self.live_plot = LivePlot(self.root, self.canvas, self.ax, title, xlabel, ylabel, theory_label,
+                                      rate=self.PLOT_RATE, on_draw=self.show_redraw_time, band_label=band_label)
 
-        if algorithm_name == "Karger Min-Cut":
-            if mode == "Monte Carlo":
-                self.run_karger_monte_carlo()
-            elif mode == "Histogram":
-                self.run_histogram()
-            else:
-                self.queue.put(("visual_karger", None))
+        # Refitted on every update; the best model is drawn next to the points
+        fits = fit_models(x, empirical, np.square(std_dev), trials)
+        if fits:
+            best = fits[0]
+            curve = np.linspace(min(x), max(x), 200)
+            self.live_plot.set_fit(curve, best.predict(curve), f"Best fit: {best.describe()}")
+
+            lines = [f"{fit.describe()}  (chi2/dof {fit.reduced_chi2():.2f}, ΔAIC {fit.aic - best.aic:.1f})"
+                     for fit in fits[:3]]
+        else:
+            lines = []
+
+        if self.live_plot.band is not None:
+            _, low, high = comparison_bands(x, trials)
+            self.live_plot.set_band(x, low, high)
+            lines.append(f"Exact mean check: max |z| = {np.abs(z_scores(x, empirical, trials)).max():.2f}")
+
+        self.fit_status.config(text="\n".join(lines))
+
+        self.live_plot.update(x, empirical, theoretical, std_dev)
+
+    def close_live_plot(self):
+        if self.live_plot is not None:
+            self.live_plot.close()
+            self.live_plot = None
+
+    def add_plot_time(self, seconds):
+        self.plot_seconds += seconds
+        if self.phase_log is not None:
+            self.phase_log.add_plot(seconds)
+
+    def flush_plot(self):
+        # Runs on the sweep thread: returns once the main thread has drawn every queued update
+        done = threading.Event()
+        self.queue.put(("flush_plot", done))
+        done.wait(self.FLUSH_TIMEOUT)
+
+    def show_redraw_time(self, plot):
+        self.add_plot_time(plot.redraw_time)
+        self.plot_status.config(text=f"Redraw: {plot.redraw_time * 1000:.1f} ms ({plot.points} points)")
+
+    def show_phases(self, item):
+        # Throughput of the latest n and each phase's share of the time spent so far
+        _, n, trials, seconds, rate, phases = item
+
+        for name, value in phases.items():
+            self.phase_totals[name] = self.phase_totals.get(name, 0.0) + value
+
+        shares = [(name, self.phase_totals[name]) for name in PHASES if name in self.phase_totals]
+        shares.append(("plot", self.plot_seconds))
+        total = sum(value for _, value in shares) or 1.0
+
+        lines = [f"Throughput: {rate:.1f} trials/s (n = {n})"]
+        lines += [f"{name}: {value:.2f} s ({value / total:.0%})" for name, value in shares]
+        self.phase_status.config(text="\n".join(lines))
+
+    def _run_simulation_thread(self, algorithm_name, mode):
+        if mode in ("Monte Carlo", "Histogram"):
+            self.run_experiment(algorithm_name, mode)
             return
 
-        if algorithm_name == "Randomized Quick Sort":
-            if mode == "Monte Carlo":
-                self.run_quick_monte_carlo()
-            elif mode == "Histogram":
-                self.run_histogram()
-            else:
-                self.queue.put(("visual_sort", None))
+        if algorithm_name == "Random Graph BFS":
+            self.queue.put(("visual_bfs", None))
+        elif algorithm_name == "Karger Min-Cut":
+            self.queue.put(("visual_karger", None))
+        elif algorithm_name == "Randomized Quick Sort":
+            self.queue.put(("visual_sort", None))
+        else:
+            print(f"Visualization is not available for {algorithm_name}")
 
     def run_simulation(self):
         self.stop_requested = False
 
+        # The next Monte Carlo message starts a new plot
+        self.close_live_plot()
+        self.plot_metric = self.selected_metric()
+        self.phase_totals = {}
+        self.plot_seconds = 0.0
+        self.phase_log = None
+
         algorithm_name = self.algorithm_choice.get()
         mode = self.mode_choice.get()
 
@@ -751,9 +795,6 @@ class SimulationGUI:
         )
         thread.start()
 
-        # Start checking queue for updates
-        self.root.after(50, self.process_queue)
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = SimulationGUI(root)
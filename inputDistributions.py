@@ -0,0 +1,106 @@
+""" Input arrays for the sorting trials, generated a block of trials at a time.
+
+An InputPool fills all k inputs of one n with a few in-place NumPy calls on a k x n buffer that is kept and
+reused, so the trial loop only sorts rows of it. Row i is a SplitMix64 counter hash of trial i's 64-bit seed,
+so an input depends only on its trial's seed, never on the other trials of the block or the worker count.
+Every distribution holds values in [0, 1.01):
+    - "uniform": independent uniform values
+    - "sorted" / "reversed": uniform values in ascending / descending order
+    - "nearly_sorted": rank / n plus uniform jitter of NEARLY_SORTED_JITTER, so every value lies within about
+      that fraction of n positions of its sorted place
+    - "few_unique": uniform values rounded down to UNIQUE_VALUES distinct keys
+    - "adversarial": every key equal. Random pivots make the order of an input irrelevant; duplicates are
+      what Lomuto's <= scan cannot split, so this is its worst case (n² / 2 comparisons) """
+
+import numpy as np
+
+DISTRIBUTIONS = ("uniform", "sorted", "reversed", "nearly_sorted", "few_unique", "adversarial")
+
+# Distributions without repeated keys, whose comparison counts follow quickSortTheory
+DISTINCT = ("uniform", "sorted", "reversed", "nearly_sorted")
+
+UNIQUE_VALUES = 10
+NEARLY_SORTED_JITTER = 0.01
+
+# Upper bound on the pool's buffers; longer inputs are generated fewer rows at a time
+POOL_BYTES = 64 * 2 ** 20
+
+# SplitMix64 increment and mixing constants
+GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX2 = np.uint64(0x94D049BB133111EB)
+
+class InputPool:
+    """ Reusable buffer of trial inputs of one distribution. fill() returns a (len(seeds), n) view that stays
+    valid until the next fill; rows(n) is the most seeds one fill takes for inputs of length n. """
+
+    def __init__(self, distribution="uniform", max_bytes=POOL_BYTES):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown input distribution: {distribution}")
+        self.distribution = distribution
+        self.max_bytes = max_bytes
+
+        self.values = np.empty(0)
+        self.state = np.empty(0, dtype=np.uint64)
+        self.bits = np.empty(0, dtype=np.uint64)
+
+        # Per-n constants: SplitMix64 counters (j + 1) * GAMMA and the ramp j / n
+        self.n = None
+        self.counters = None
+        self.ramp = None
+
+    def rows(self, n):
+        # The values, state and bits buffers take 24 bytes per element
+        return max(1, self.max_bytes // (24 * max(n, 1)))
+
+    def fill(self, n, seeds):
+        k = len(seeds)
+        if k > self.rows(n):
+            raise ValueError(f"At most {self.rows(n)} inputs of length {n} fit in one fill")
+
+        self._reserve(n, k * n)
+        values = self.values[:k * n].reshape(k, n)
+        state = self.state[:k * n].reshape(k, n)
+        bits = self.bits[:k * n].reshape(k, n)
+
+        if self.distribution == "adversarial":
+            values.fill(0.5)
+            return values
+
+        # SplitMix64 of seed + (j + 1) * GAMMA, then the top 53 bits as a double in [0, 1)
+        np.add(self.counters, np.array(seeds, dtype=np.uint64)[:, None], out=state)
+        for shift, multiplier in ((30, MIX1), (27, MIX2), (31, None)):
+            np.right_shift(state, np.uint64(shift), out=bits)
+            np.bitwise_xor(state, bits, out=state)
+            if multiplier is not None:
+                np.multiply(state, multiplier, out=state)
+        np.right_shift(state, np.uint64(11), out=state)
+        np.multiply(state, 2.0 ** -53, out=values)
+
+        if self.distribution == "sorted":
+            values.sort(axis=1)
+        elif self.distribution == "reversed":
+            np.negative(values, out=values)
+            values.sort(axis=1)
+            np.negative(values, out=values)
+        elif self.distribution == "nearly_sorted":
+            np.multiply(values, NEARLY_SORTED_JITTER, out=values)
+            np.add(values, self.ramp, out=values)
+        elif self.distribution == "few_unique":
+            np.multiply(values, UNIQUE_VALUES, out=values)
+            np.floor(values, out=values)
+            np.divide(values, UNIQUE_VALUES, out=values)
+
+        return values
+
+    def _reserve(self, n, size):
+        # Buffers only grow; the per-n constants are rebuilt when n changes
+        if len(self.values) < size:
+            self.values = np.empty(size)
+            self.state = np.empty(size, dtype=np.uint64)
+            self.bits = np.empty(size, dtype=np.uint64)
+
+        if self.n != n:
+            self.n = n
+            self.counters = np.arange(1, n + 1, dtype=np.uint64) * GAMMA
+            self.ramp = np.arange(n) / max(n, 1)
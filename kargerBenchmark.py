@@ -0,0 +1,48 @@
+import time
+import numpy as np
+from scipy import stats
+from kargerMinCut import KargerMinCut
+
+def run_engine(engine, G, k):
+    # Runs k Karger trials on G with the given engine, returns (cut sizes, seconds)
+    karger = KargerMinCut(engine)
+    graph = karger.prepare(G)
+
+    start = time.perf_counter()
+    cuts = karger.run_karger_trials(graph, k).tolist()
+    elapsed = time.perf_counter() - start
+
+    return cuts, elapsed
+
+def compare_distributions(cuts_a, cuts_b):
+    # Chi-square test of homogeneity on the two cut-size distributions, returns the p-value
+    values = sorted(set(cuts_a) | set(cuts_b))
+    if len(values) < 2:
+        return 1.0
+
+    table = [
+        [cuts_a.count(v) for v in values],
+        [cuts_b.count(v) for v in values]
+    ]
+    return stats.chi2_contingency(table)[1]
+
+if __name__ == "__main__":
+    n_values = [10, 20, 30]
+    k = 300
+
+    generator = KargerMinCut()
+
+    print(f"{'n':>4} {'engine':>12} {'time (s)':>10} {'speedup':>9} {'mean cut':>9} {'p-value':>9}")
+
+    for n in n_values:
+        G = generator.generate_graph(n)
+
+        # The NetworkX engine is the reference every other engine is compared against
+        nx_cuts, nx_time = run_engine("networkx", G, k)
+        print(f"{n:>4} {'networkx':>12} {nx_time:>10.3f} {1.0:>9.1f} {np.mean(nx_cuts):>9.2f} {'-':>9}")
+
+        for engine in ("union_find", "batch"):
+            cuts, elapsed = run_engine(engine, G, k)
+            p_value = compare_distributions(nx_cuts, cuts)
+
+            print(f"{n:>4} {engine:>12} {elapsed:>10.3f} {nx_time / elapsed:>9.1f} {np.mean(cuts):>9.2f} {p_value:>9.3f}")
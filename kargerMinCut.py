@@ -1,22 +1,167 @@
+import math
 import random
+import numpy as np
 import networkx as nx
+from scipy import sparse
+from scipy.sparse.csgraph import minimum_spanning_tree, connected_components
+from graphSampling import ConnectedGraphSampler
 
 class KargerMinCut:
-    """ Implements Karger's Randomized Min-Cut algorithm. Designed for both Monte Carlo simulation and visualization. """
+    """ Implements Karger's Randomized Min-Cut algorithm. Designed for both Monte Carlo simulation and visualization.
+    Contraction engines:
+        - "union_find": converts the graph once into NumPy edge arrays and contracts with a path-compressed union-find
+        - "batch": runs many trials at once as random-weight minimum spanning forests (see run_karger_batch)
+        - "networkx": contracts a NetworkX multigraph with nx.contracted_nodes (slow reference implementation) """
+
+    ENGINES = ("union_find", "batch", "networkx")
+
+    def __init__(self, engine="union_find", sampling="rejection"):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown Karger engine: {engine}")
+        self.engine = engine
+
+        # Tracks rejected draws; see ConnectedGraphSampler for the sampling strategies
+        self.sampler = ConnectedGraphSampler(0.4, strategy=sampling)
 
     def generate_graph(self, n, p=0.4):
         """ Generate a connected random graph. """
-        while True:
-            G = nx.erdos_renyi_graph(n, p)
-            if nx.is_connected(G):
-                return G
+        return self.sampler.sample(n, p)
+
+    def to_edge_arrays(self, G):
+        """ Converts a graph into (n, src, dst) where src/dst are int32 NumPy arrays of node indices. """
+        return to_edge_arrays(G)
+
+    def prepare(self, G):
+        """ Converts G once into the form run_karger consumes fastest for the selected engine. """
+        if self.engine == "networkx":
+            return G
+        return self.to_edge_arrays(G)
 
     def run_karger(self, G):
-        """ Runs Karger's algorithm and returns the cut size. """
-        G = G.copy()
+        """ Runs Karger's algorithm and returns the cut size.
+        G may be a NetworkX graph or the (n, src, dst) tuple returned by to_edge_arrays. """
+        if self.engine == "networkx":
+            return self._run_karger_networkx(G)
+
+        if self.engine == "batch":
+            return {
+                "cut_size": int(self.run_karger_batch(G, 1)[0])
+            }
+
+        if isinstance(G, tuple):
+            n, src, dst = G
+        else:
+            n, src, dst = self.to_edge_arrays(G)
+
+        parent = list(range(n))
+        self._contract(parent, src.tolist(), dst.tolist(), n, 2)
+
+        return {
+            "cut_size": self._crossing_edges(parent, src, dst)
+        }
+
+    def run_karger_trials(self, G, k):
+        """ Runs k independent Karger trials on the same graph and returns the cut sizes as an array.
+        The batch engine computes all k in one call, the other engines loop over run_karger. """
+        graph = self.prepare(G) if not isinstance(G, tuple) else G
+
+        if self.engine == "batch":
+            return self.run_karger_batch(graph, k)
+
+        return np.array([self.run_karger(graph)["cut_size"] for _ in range(k)], dtype=np.int64)
+
+    def run_karger_batch(self, G, k):
+        """ Runs k Karger trials at once and returns the k cut sizes as an array.
+        Contracting uniformly random edges until two supernodes remain is Kruskal's algorithm on uniformly random
+        edge weights stopped one merge early, i.e. the minimum spanning tree without its heaviest edge.
+        All k weight vectors are drawn in one call and the k copies of the graph are solved as a single
+        block-diagonal minimum spanning forest. Expects a connected simple graph. """
+        if isinstance(G, tuple):
+            n, src, dst = G
+        else:
+            n, src, dst = self.to_edge_arrays(G)
+
+        m = len(src)
+
+        # Weights in [1, 2) so no edge is dropped as an explicit zero
+        weights = np.random.random((k, m)) + 1.0
+
+        offsets = (np.arange(k, dtype=np.int64) * n)[:, None]
+        rows = (src + offsets).ravel()
+        cols = (dst + offsets).ravel()
+
+        adjacency = sparse.csr_matrix((weights.ravel(), (rows, cols)), shape=(k * n, k * n))
+        forest = minimum_spanning_tree(adjacency).tocoo()
+
+        # Drop the heaviest tree edge of every block: sort by (block, weight) and take the last of each block
+        block = forest.row // n
+        order = np.lexsort((forest.data, block))
+        last_of_block = np.r_[block[order][1:] != block[order][:-1], True]
+        keep = np.ones(len(order), dtype=bool)
+        keep[order[last_of_block]] = False
+
+        halves = sparse.csr_matrix(
+            (np.ones(np.count_nonzero(keep)), (forest.row[keep], forest.col[keep])),
+            shape=(k * n, k * n)
+        )
+        _, labels = connected_components(halves, directed=False)
+
+        return np.count_nonzero((labels[rows] != labels[cols]).reshape(k, m), axis=1)
+
+    def run_karger_stein(self, G):
+        """ Runs the Karger-Stein recursive contraction algorithm and returns the cut size together with the
+        number of contractions performed. Always uses the union-find contraction primitive of run_karger. """
+        if isinstance(G, tuple):
+            n, src, dst = G
+        else:
+            n, src, dst = self.to_edge_arrays(G)
+
+        cut_size, contractions = self._karger_stein(n, src, dst)
+
+        return {
+            "cut_size": cut_size,
+            "contractions": contractions
+        }
+
+    def _karger_stein(self, n, src, dst):
+        # Small graphs are contracted straight down to two supernodes
+        if n <= 6:
+            parent = list(range(n))
+            _, contractions = self._contract(parent, src.tolist(), dst.tolist(), n, 2)
+            return self._crossing_edges(parent, src, dst), contractions
+
+        # Contract to n / sqrt(2) supernodes twice independently, recurse on both and keep the better cut
+        target = math.ceil(1 + n / math.sqrt(2))
+        best_cut = None
+        total_contractions = 0
+
+        for _ in range(2):
+            parent = list(range(n))
+            _, contractions = self._contract(parent, src.tolist(), dst.tolist(), n, target)
+
+            cut_size, sub_contractions = self._karger_stein(*self._compact(parent, src, dst))
+            total_contractions += contractions + sub_contractions
+
+            if best_cut is None or cut_size < best_cut:
+                best_cut = cut_size
+
+        return best_cut, total_contractions
+
+    def _compact(self, parent, src, dst):
+        # Relabels supernodes to 0..t-1 and drops self-loop edges so recursion works on the contracted multigraph
+        roots, labels = np.unique(self._roots(parent), return_inverse=True)
+        src = labels[src].astype(np.int32)
+        dst = labels[dst].astype(np.int32)
+        keep = src != dst
+
+        return len(roots), src[keep], dst[keep]
+
+    def _run_karger_networkx(self, G):
+        # Parallel edges must survive contraction, otherwise the final cut always collapses to a single edge
+        G = nx.MultiGraph(G)
 
         while len(G.nodes) > 2:
-            u, v = random.choice(list(G.edges))
+            u, v, _ = random.choice(list(G.edges))
 
             # Contract edge
             G = nx.contracted_nodes(G, u, v, self_loops=False)
@@ -28,19 +173,110 @@ class KargerMinCut:
             "cut_size": cut_size
         }
 
+    # Union-find contraction primitive
+    def _contract(self, parent, src, dst, components, target):
+        """ Contracts uniformly random edges until target supernodes remain.
+        Edges are visited in a random permutation, skipping self-loops lazily, which is equivalent to repeatedly
+        picking a random edge of the contracted multigraph. Returns (components, contractions). """
+        contractions = 0
+
+        for e in np.random.permutation(len(src)).tolist():
+            if components <= target:
+                break
+
+            root_u = _find(parent, src[e])
+            root_v = _find(parent, dst[e])
+
+            if root_u != root_v:
+                parent[root_v] = root_u
+                components -= 1
+                contractions += 1
+
+        return components, contractions
+
+    def _crossing_edges(self, parent, src, dst):
+        # Number of edges whose endpoints ended up in different supernodes
+        roots = self._roots(parent)
+        return int(np.count_nonzero(roots[src] != roots[dst]))
+
+    def _roots(self, parent):
+        return np.array([_find(parent, i) for i in range(len(parent))], dtype=np.int32)
+
     def contraction_generator(self, G):
-        """ Generator for visualization. Yields graph state after each contraction. """
-        G = G.copy()
+        """ Generator for visualization. Contracts G down to two super-nodes in place on one adjacency map of
+        edge multiplicities (never copying the graph) and yields one merge event per contraction:
+            (absorbed, survivor, self_loops, edges)
+        absorbed is merged into survivor (both labels of G; the survivor keeps its label), self_loops is the
+        number of parallel edges between them that the merge removed, and edges the edge count afterwards.
+        Edges are picked uniformly among the remaining multigraph edges, as in the union-find engine.
+        Use materialize(G, events) to rebuild the contracted multigraph after any number of events. """
+        nodes = list(G.nodes)
+        n, src, dst = to_edge_arrays(G)
 
-        while len(G.nodes) > 2:
-            # Choose random edge
-            u, v = random.choice(list(G.edges))
+        # adjacency[u][w] = number of parallel edges between super-nodes u and w
+        adjacency = [{} for _ in range(n)]
+        for u, w in zip(src.tolist(), dst.tolist()):
+            adjacency[u][w] = adjacency[u].get(w, 0) + 1
+            adjacency[w][u] = adjacency[w].get(u, 0) + 1
 
-            # Yield state BEFORE contraction
-            yield G.copy(), (u, v)
+        parent = list(range(n))
+        components = n
+        edges = len(src)
 
-            # Contract the edge
-            G = nx.contracted_nodes(G, u, v, self_loops=False)
+        # Walking a random edge order and skipping edges inside a super-node picks uniformly among live edges
+        for e in np.random.permutation(len(src)).tolist():
+            if components <= 2:
+                break
+
+            survivor, absorbed = _find(parent, src[e]), _find(parent, dst[e])
+            if survivor == absorbed:
+                continue
+
+            parent[absorbed] = survivor
+            components -= 1
+
+            self_loops = adjacency[survivor].pop(absorbed)
+            del adjacency[absorbed][survivor]
+            edges -= self_loops
+
+            for w, count in adjacency[absorbed].items():
+                adjacency[survivor][w] = adjacency[survivor].get(w, 0) + count
+                adjacency[w][survivor] = adjacency[w].get(survivor, 0) + count
+                del adjacency[w][absorbed]
+            adjacency[absorbed] = {}
+
+            yield nodes[absorbed], nodes[survivor], self_loops, edges
+
+    def materialize(self, G, events):
+        """ Multigraph after applying the given merge events to G (e.g. events[:k] for step k). """
+        owner = {node: node for node in G.nodes}
+
+        def root(node):
+            while owner[node] != node:
+                node = owner[node]
+            return node
+
+        for absorbed, survivor, _, _ in events:
+            owner[root(absorbed)] = root(survivor)
+
+        H = nx.MultiGraph()
+        H.add_nodes_from(node for node in G.nodes if root(node) == node)
+        H.add_edges_from((root(u), root(v)) for u, v in G.edges() if root(u) != root(v))
+        return H
+
+def to_edge_arrays(G):
+    # Edge array form shared by the union-find engine and the min-cut oracle
+    index = {node: i for i, node in enumerate(G.nodes)}
+    m = G.number_of_edges()
+
+    src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int32, count=m)
+    dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int32, count=m)
+
+    return len(index), src, dst
 
-        # Final state
-        yield G.copy(), None
\ No newline at end of file
+def _find(parent, x):
+    # Find with path halving
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
@@ -0,0 +1,122 @@
+import time
+import numpy as np
+from matplotlib.collections import LineCollection
+
+class LivePlot:
+    """ Monte Carlo sweep plot that is updated in place while the sweep runs.
+    The mean line, error bars, caps and theory line are created once; update() only replaces their data.
+    Redraws go through canvas.draw_idle() at most rate times per second: updates arriving faster only
+    replace the data of the pending redraw. redraw_time holds the time from the last redraw request
+    until the canvas finished drawing it. Without a theory_label the theory line stays out of the legend.
+    An optional fitted curve (set_fit) is drawn dashed, its legend entry naming the model; with a
+    band_label, a shaded band (set_band) shows where the theory expects the means. """
+
+    def __init__(self, root, canvas, ax, title, xlabel, ylabel, theory_label, rate=10.0, on_draw=None,
+                 band_label=None):
+        self.root = root
+        self.canvas = canvas
+        self.ax = ax
+        self.interval = 1.0 / rate
+        self.on_draw = on_draw
+
+        # Same look as ax.errorbar(fmt="o-", capsize=4), but as artists whose data can be replaced
+        self.mean_line, = self.ax.plot([], [], "o-", color="C0", label="Empirical Mean + Std Dev")
+        self.error_bars = LineCollection([], colors="C0")
+        self.ax.add_collection(self.error_bars)
+        self.caps, = self.ax.plot([], [], "_", color="C0", markersize=8)
+        self.theory_line, = self.ax.plot([], [], color="C1", label=theory_label or "_nolegend_")
+        self.fit_line, = self.ax.plot([], [], "--", color="C2", label="Best fit")
+
+        self.band = None
+        if band_label:
+            self.band = self.ax.fill_between([], [], [], color="C1", alpha=0.25, linewidth=0, label=band_label)
+
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_title(title)
+        self.legend = self.ax.legend()
+        self.fit_label = self.legend.get_texts()[self.ax.get_legend_handles_labels()[0].index(self.fit_line)]
+
+        self.points = 0
+        self.redraws = 0
+        self.redraw_time = None
+
+        self.job = None
+        self.last_draw = None
+        self.requested = None
+        self.draw_event = self.canvas.mpl_connect("draw_event", self._drawn)
+
+    def update(self, x, empirical, theoretical, std_dev):
+        x = np.asarray(x, dtype=float)
+        empirical = np.asarray(empirical, dtype=float)
+        std_dev = np.asarray(std_dev, dtype=float)
+        low, high = empirical - std_dev, empirical + std_dev
+
+        self.mean_line.set_data(x, empirical)
+        self.error_bars.set_segments(np.stack((np.column_stack((x, low)), np.column_stack((x, high))), axis=1))
+        self.caps.set_data(np.concatenate((x, x)), np.concatenate((low, high)))
+        self.theory_line.set_data(x, theoretical)
+        self.points = len(x)
+
+        # relim() skips collections, so the error bar ends are added by hand
+        self.ax.relim()
+        if self.points:
+            self.ax.update_datalim(np.column_stack((np.concatenate((x, x)), np.concatenate((low, high)))))
+        self.ax.autoscale_view()
+
+        self._schedule()
+
+    def set_band(self, x, low, high):
+        # Shown with the next update
+        x = np.asarray(x, dtype=float)
+        outline = np.concatenate((np.column_stack((x, low)), np.column_stack((x, high))[::-1]))
+        self.band.set_verts([outline])
+
+    def set_fit(self, x, y, label):
+        # Shown with the next update
+        self.fit_line.set_data(x, y)
+        self.fit_label.set_text(label)
+
+    def flush(self):
+        # Draws a pending redraw now, so that its time is reported before the caller goes on
+        if self.job is None and self.requested is None:
+            return
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+        self.last_draw = self.requested = time.perf_counter()
+        self.canvas.draw()
+
+    def close(self):
+        # Cancels a pending redraw and stops listening to the canvas; the artists stay on the axes
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.canvas.mpl_disconnect(self.draw_event)
+
+    def _schedule(self):
+        if self.job is not None:
+            return
+
+        delay = 0.0
+        if self.last_draw is not None:
+            delay = max(0.0, self.last_draw + self.interval - time.perf_counter())
+        self.job = self.root.after(int(delay * 1000), self._draw)
+
+    def _draw(self):
+        self.job = None
+        self.last_draw = self.requested = time.perf_counter()
+        self.canvas.draw_idle()
+
+    def _drawn(self, event):
+        # Draws not requested here (e.g. a resize) are not timed
+        if self.requested is None:
+            return
+
+        self.redraw_time = time.perf_counter() - self.requested
+        self.requested = None
+        self.redraws += 1
+
+        if self.on_draw:
+            self.on_draw(self)
@@ -1,15 +1,15 @@
 import numpy as np
 import math
 from scipy import stats
-from mergeSort import MergeSort
+from quickSort import QuickSort
 
 def run_monte_carlo(n, k):
-    ms = MergeSort()
+    qs = QuickSort()
     results = []
 
     for _ in range(k):
         arr = np.random.uniform(0, 1, n)
-        metrics = ms.sort(arr)
+        metrics = qs.sort(arr)
         results.append(metrics["comparisons"])
 
     return results
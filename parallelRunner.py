@@ -0,0 +1,175 @@
+import math
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+
+from trialKernels import KERNELS
+
+class ParallelRunner:
+    """ Fans Monte Carlo work units (n, block of trials) out to a process pool.
+    Every trial gets its own child of numpy.random.SeedSequence(seed): one spawned sequence per input size,
+    one spawned per trial below that. Results are therefore bit-for-bit identical for any worker count.
+    run() yields (n, metrics) per input size, in order of n, as soon as all trials for that n are done.
+    run_adaptive() instead runs rounds of trials per n until a convergence callback is satisfied.
+    Both accept the positions of n_values within the full sweep, so a resumed sweep that skips finished
+    input sizes still draws the same seeds for the rest. """
+
+    def __init__(self, workers=1, seed=None, chunk_size=None):
+        self.workers = max(1, int(workers))
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        # Entropy actually used, so an unseeded run can still be reproduced
+        self.entropy = np.random.SeedSequence(seed).entropy
+
+    def run(self, kernel, n_values, trials, params=None, should_stop=None, positions=None):
+        params = params or {}
+        should_stop = should_stop or (lambda: False)
+
+        units = self._build_units(n_values, trials, positions or range(len(n_values)))
+
+        if self.workers == 1:
+            yield from self._run_serial(kernel, n_values, units, params, should_stop)
+        else:
+            yield from self._run_pool(kernel, n_values, units, params, should_stop)
+
+    def run_adaptive(self, kernel, n_values, block_size, max_trials, converged, params=None, should_stop=None,
+                     positions=None):
+        """ For each n, runs rounds of block_size trials (split across the workers) until
+        converged(n, round_metrics) returns True or max_trials trials have run.
+        Round sizes do not depend on the worker count, so neither do the results.
+        Yields (n, round_metrics, finished) after every round. """
+        params = params or {}
+        should_stop = should_stop or (lambda: False)
+
+        with self._pool() as pool:
+            for position, n in zip(positions or range(len(n_values)), n_values):
+                done = 0
+
+                while done < max_trials:
+                    if should_stop():
+                        return
+
+                    count = min(block_size, max_trials - done)
+                    metrics = self._run_round(pool, kernel, position, n, done, count, params)
+                    done += count
+
+                    finished = converged(n, metrics) or done >= max_trials
+                    yield n, metrics, finished
+
+                    if finished:
+                        break
+
+    def seeds(self, position, start, count):
+        # Same children as SeedSequence(entropy).spawn(...)[position].spawn(...)[start:start + count]
+        return [
+            np.random.SeedSequence(self.entropy, spawn_key=(position, trial))
+            for trial in range(start, start + count)
+        ]
+
+    def _build_units(self, n_values, trials, positions):
+        # Units are (index of n in n_values, n, first trial index, seeds); seeds follow the sweep position
+        chunk = self.chunk_size or max(1, trials // (4 * self.workers))
+
+        units = []
+        for index, (position, n) in enumerate(zip(positions, n_values)):
+            for start in range(0, trials, chunk):
+                units.append((index, n, start, self.seeds(position, start, min(chunk, trials - start))))
+
+        return units
+
+    def _pool(self):
+        if self.workers == 1:
+            return nullcontext(None)
+
+        # Spawn keeps Tk and thread state of the parent out of the workers
+        context = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def _run_round(self, pool, kernel, position, n, start, count, params):
+        # Runs trials [start, start + count) of one input size and merges them in trial order
+        if pool is None:
+            return run_unit(kernel, n, self.seeds(position, start, count), params)
+
+        chunk = self.chunk_size or math.ceil(count / self.workers)
+        futures = [
+            pool.submit(run_unit, kernel, n, self.seeds(position, first, min(chunk, start + count - first)), params)
+            for first in range(start, start + count, chunk)
+        ]
+
+        metrics = {}
+        for future in futures:
+            for name, values in future.result().items():
+                metrics.setdefault(name, []).extend(values)
+
+        return metrics
+
+    def _run_serial(self, kernel, n_values, units, params, should_stop):
+        collector = _Collector(n_values, units)
+
+        for position, n, start, seeds in units:
+            if should_stop():
+                return
+
+            collector.add(position, start, run_unit(kernel, n, seeds, params))
+            yield from collector.completed()
+
+    def _run_pool(self, kernel, n_values, units, params, should_stop):
+        collector = _Collector(n_values, units)
+
+        with self._pool() as pool:
+            pending = {
+                pool.submit(run_unit, kernel, n, seeds, params): (position, start)
+                for position, n, start, seeds in units
+            }
+
+            while pending:
+                if should_stop():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return
+
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    position, start = pending.pop(future)
+                    collector.add(position, start, future.result())
+
+                yield from collector.completed()
+
+class _Collector:
+    """ Reassembles finished units into per-n metrics in trial order. """
+
+    def __init__(self, n_values, units):
+        self.n_values = n_values
+        self.expected = [0] * len(n_values)
+        for unit in units:
+            self.expected[unit[0]] += 1
+
+        self.blocks = {}
+        self.next_position = 0
+
+    def add(self, position, start, metrics):
+        self.blocks.setdefault(position, {})[start] = metrics
+
+    def completed(self):
+        # Yields every input size whose units are all finished, in order of n
+        while self.next_position < len(self.n_values):
+            position = self.next_position
+            blocks = self.blocks.get(position, {})
+
+            if len(blocks) < self.expected[position]:
+                return
+
+            metrics = {}
+            for start in sorted(blocks):
+                for name, values in blocks[start].items():
+                    metrics.setdefault(name, []).extend(values)
+
+            self.blocks.pop(position, None)
+            self.next_position += 1
+            yield self.n_values[position], metrics
+
+def run_unit(kernel, n, seeds, params):
+    # Executed in the worker process
+    return KERNELS[kernel](n, seeds, params)
@@ -0,0 +1,100 @@
+""" Per-phase timing of Monte Carlo trials (graph generation, algorithm, min-cut oracle) and of plotting them.
+
+Kernels mark phase boundaries with a PhaseTimer and return the time of each phase per trial as extra
+"phase_<name>" metric lists. The engine sums them per n into a PhaseLog, which reports throughput and the
+phase breakdown after every n and exports it next to the results CSV. The GUI adds its plotting time with
+add_plot(); headless runs export 0 plot seconds. A disabled timer adds no metrics and each lap() is a single
+attribute check. """
+
+import threading
+import time
+
+from dataExport import export_csv
+
+PHASES = ("generate", "oracle", "algorithm")
+
+class PhaseTimer:
+    """ Splits each trial into consecutive phases: start() begins a trial, lap(name) ends the phase named. """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.times = {}
+        self.mark = None
+
+    def start(self):
+        if self.enabled:
+            self.mark = time.perf_counter()
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.times.setdefault(name, []).append(now - self.mark)
+        self.mark = now
+
+    def spread(self, name, seconds, trials):
+        # Charges an equal share of a phase that ran once for a whole block of trials
+        if self.enabled:
+            self.times.setdefault(name, []).extend([seconds / max(1, trials)] * trials)
+
+    def attach(self, metrics):
+        # Adds the per-trial phase times to a kernel's metrics
+        for name, values in self.times.items():
+            metrics["phase_" + name] = values
+        return metrics
+
+class PhaseLog:
+    """ Phase totals of a sweep, one row per finished n. Seconds are summed over trials, so with several
+    workers they add up to more than the elapsed wall time. Plot seconds are charged to the latest finished n
+    when the plot is drawn; flush, when given, is called before exporting and returns once pending plots
+    have been added. """
+
+    def __init__(self, flush=None):
+        self.totals = {}
+        self.rows = []
+        self.last = time.perf_counter()
+        self.file = None
+        self.flush = flush
+
+        # add_plot() runs on the GUI thread while the sweep thread appends rows
+        self.lock = threading.Lock()
+        self.plot = 0.0
+
+    def record(self, n, metrics):
+        # Adds a block of kernel results for n
+        totals = self.totals.setdefault(n, {})
+        for name, values in metrics.items():
+            if name.startswith("phase_"):
+                totals[name[6:]] = totals.get(name[6:], 0.0) + sum(values)
+
+    def finish(self, n, trials):
+        """ Closes n and returns its ("phases", n, trials, seconds, trials_per_sec, phase seconds) message. """
+        now = time.perf_counter()
+        seconds, self.last = now - self.last, now
+
+        phases = self.totals.pop(n, {})
+        with self.lock:
+            self.rows.append([n, trials, seconds, trials / seconds if seconds else 0.0]
+                             + [phases.get(name, 0.0) for name in PHASES] + [self.plot])
+            self.plot = 0.0
+
+        return ("phases", n, trials, seconds, self.rows[-1][3], phases)
+
+    def add_plot(self, seconds):
+        # Plotting before the first n finishes is charged to it
+        with self.lock:
+            if self.rows:
+                self.rows[-1][-1] += seconds
+            else:
+                self.plot += seconds
+
+    def headers(self):
+        return (["n", "trials", "seconds", "trials_per_sec"] + [f"{name}_seconds" for name in PHASES]
+                + ["plot_seconds"])
+
+    def export(self, filename_prefix):
+        if self.flush is not None:
+            self.flush()
+        self.file = export_csv(self.rows, self.headers(), filename_prefix + "_phases")
+        return self.file
@@ -1,53 +1,259 @@
 import random
+import numpy as np
 
 class QuickSort:
-    def __init__(self):
+    """ Randomized Quick Sort counting comparisons against the pivots and swaps that change the array.
+    The partition scheme is one of PARTITIONS:
+        - "lomuto": one pivot moved to the end; elements <= pivot are gathered in front of it
+        - "hoare": one pivot; two scans from the ends swap out-of-place pairs until they cross
+        - "three_way": Dijkstra's < pivot | == pivot | > pivot, so equal keys are never partitioned again
+        - "dual_pivot": Yaroslavskiy's two pivots p <= q splitting into < p | p..q | > q
+    The "recursive" engine sorts a list copy of the input in recursion order. The "buffer" engine (Lomuto only)
+    sorts a copy in a NumPy buffer kept between calls, iteratively: segments wait on an explicit stack, the
+    smaller side of each partition is sorted first (so at most log2(n) segments wait) and large segments are
+    partitioned with vectorized NumPy calls into preallocated scratch arrays. Both leave every segment in the
+    order Lomuto's swaps produce, so they count the same comparisons and swaps for the same pivot choices; the
+    order of the random pivot draws differs, so a given seed gives different (identically distributed) counts. """
+
+    ENGINES = ("recursive", "buffer")
+    PARTITIONS = ("lomuto", "hoare", "three_way", "dual_pivot")
+
+    # Segments up to this length are finished with a plain Python loop, cheaper than NumPy calls there
+    SMALL_SEGMENT = 256
+
+    def __init__(self, engine="recursive", partition="lomuto"):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown Quick Sort engine: {engine}")
+        if partition not in self.PARTITIONS:
+            raise ValueError(f"Unknown partition scheme: {partition}")
+        if engine == "buffer" and partition != "lomuto":
+            raise ValueError("The buffer engine only implements Lomuto partitioning")
+        self.engine = engine
+        self.partition = partition
+
+        # Partition step of sort_generator: yields the events of one segment, returns the segments left to sort
+        self.partition_step = {
+            "lomuto": self._lomuto_generator,
+            "hoare": self._hoare_generator,
+            "three_way": self._three_way_generator,
+            "dual_pivot": self._dual_pivot_generator
+        }[partition]
+
+        self.buffer = None
+        self.scratch = None
+        self.mask = None
         self.reset_metrics()
 
     def reset_metrics(self):
         self.comparisons = 0
+        self.swaps = 0
 
     def sort(self, arr):
         self.reset_metrics()
-        arr_copy = list(arr)
-        self.quick_Sort(arr_copy, 0, len(arr_copy) - 1)
-        return {"comparisons": self.comparisons}
+        if self.engine == "buffer":
+            self.comparisons, self.swaps = self._sort_buffer(self._load(arr))
+        elif self.partition == "lomuto":
+            arr_copy = list(arr)
+            self.quick_Sort(arr_copy, 0, len(arr_copy) - 1)
+        else:
+            # The other schemes are counted from their events, so the counts always match the visualization
+            for event, _, _ in self.sort_generator(arr):
+                if event == "compare":
+                    self.comparisons += 1
+                elif event == "swap":
+                    self.swaps += 1
+
+        return {"comparisons": self.comparisons, "swaps": self.swaps}
 
     def quick_Sort(self, arr, low, high):
-        if low < high:
-            pivot_index = self._random_partition(arr, low, high)
-            self.quick_Sort(arr, low, pivot_index - 1)
-            self.quick_Sort(arr, pivot_index + 1, high)
+        # Recursion order (left side first), but pending segments wait on a list: with many equal keys Lomuto's
+        # segments shrink by one element per partition, deeper than Python's recursion limit
+        stack = [(low, high)]
+        while stack:
+            low, high = stack.pop()
+            if low < high:
+                pivot_index = self._random_partition(arr, low, high)
+                stack.append((pivot_index + 1, high))
+                stack.append((low, pivot_index - 1))
 
     def sort_generator(self, arr):
-        arr = arr.copy()
+        """ Generator for visualization. Yields compact (event, first, second) tuples instead of array copies:
+            - ("pivot", pivot index, segment start) once a random pivot is in place
+            - ("compare", index, pivot index) for every comparison against a pivot
+            - ("swap", i, j) for every swap that changes the array
+        Applying the swaps in order to a copy of arr replays the sort; see SortTrace. """
+        arr = list(arr)
         yield from self.quick_sort_generator(arr, 0, len(arr) - 1)
-        yield arr, []
 
     def quick_sort_generator(self, arr, low, high):
-        if low < high:
-            pivot_index = yield from self.partition_generator(arr, low, high)
-            yield from self.quick_sort_generator(arr, low, pivot_index - 1)
-            yield from self.quick_sort_generator(arr, pivot_index + 1, high)
+        # Segments wait on a stack instead of nested generators; the leftmost one is partitioned first
+        stack = [(low, high)]
+        while stack:
+            low, high = stack.pop()
+            if low < high:
+                segments = yield from self.partition_step(arr, low, high)
+                stack.extend(reversed(segments))
 
     def partition_generator(self, arr, low, high):
+        # Same pivot choice and comparisons as _random_partition, reported as events
+        pivot_index = self._choose_pivot(low, high)
+        if pivot_index != high:
+            arr[pivot_index], arr[high] = arr[high], arr[pivot_index]
+            yield "swap", pivot_index, high
+
+        yield "pivot", high, low
+
         pivot = arr[high]
         i = low - 1
 
         for j in range(low, high):
-            if arr[j] < pivot:
+            yield "compare", j, high
+            if arr[j] <= pivot:
                 i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-                yield arr.copy(), [i, j]
+                if i != j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    yield "swap", i, j
 
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        yield arr.copy(), [i + 1, high]
+        if i + 1 != high:
+            arr[i + 1], arr[high] = arr[high], arr[i + 1]
+            yield "swap", i + 1, high
 
         return i + 1
 
+    def _lomuto_generator(self, arr, low, high):
+        pivot_index = yield from self.partition_generator(arr, low, high)
+        return [(low, pivot_index - 1), (pivot_index + 1, high)]
+
+    def _hoare_generator(self, arr, low, high):
+        # The pivot starts at low and moves with the swaps; at tracks it for the compare events
+        pivot_index = self._choose_pivot(low, high)
+        yield from self._swap(arr, pivot_index, low)
+        yield "pivot", low, low
+
+        pivot, at = arr[low], low
+        i, j = low - 1, high + 1
+
+        while True:
+            i += 1
+            yield "compare", i, at
+            while arr[i] < pivot:
+                i += 1
+                yield "compare", i, at
+
+            j -= 1
+            yield "compare", j, at
+            while arr[j] > pivot:
+                j -= 1
+                yield "compare", j, at
+
+            # With the pivot value starting at low, the scans cross before j reaches high
+            if i >= j:
+                return [(low, j), (j + 1, high)]
+
+            yield from self._swap(arr, i, j)
+            at = self._moved(at, i, j)
+
+    def _three_way_generator(self, arr, low, high):
+        # Invariant: < pivot in low..lt-1, == pivot in lt..i-1, unscanned in i..gt, > pivot in gt+1..high
+        pivot_index = self._choose_pivot(low, high)
+        yield from self._swap(arr, pivot_index, low)
+        yield "pivot", low, low
+
+        pivot, at = arr[low], low
+        lt, i, gt = low, low + 1, high
+
+        while i <= gt:
+            yield "compare", i, at
+            if arr[i] < pivot:
+                yield from self._swap(arr, lt, i)
+                at = self._moved(at, lt, i)
+                lt += 1
+                i += 1
+                continue
+
+            yield "compare", i, at
+            if arr[i] > pivot:
+                yield from self._swap(arr, i, gt)
+                at = self._moved(at, i, gt)
+                gt -= 1
+            else:
+                i += 1
+
+        return [(low, lt - 1), (gt + 1, high)]
+
+    def _dual_pivot_generator(self, arr, low, high):
+        # Pivots p <= q at low and high; invariant: < p in low+1..lt-1, p..q in lt..k-1, > q in gt+1..high-1
+        first = self._choose_pivot(low, high)
+        yield from self._swap(arr, first, low)
+        second = self._choose_pivot(low + 1, high)
+        yield from self._swap(arr, second, high)
+
+        yield "compare", low, high
+        if arr[low] > arr[high]:
+            yield from self._swap(arr, low, high)
+        yield "pivot", low, low
+        yield "pivot", high, low
+
+        p, q = arr[low], arr[high]
+        lt, k, gt = low + 1, low + 1, high - 1
+
+        while k <= gt:
+            yield "compare", k, low
+            if arr[k] < p:
+                yield from self._swap(arr, k, lt)
+                lt += 1
+            else:
+                yield "compare", k, high
+                if arr[k] > q:
+                    # Skips the elements > q at the right end, then swaps arr[k] there
+                    while k < gt:
+                        yield "compare", gt, high
+                        if arr[gt] <= q:
+                            break
+                        gt -= 1
+
+                    yield from self._swap(arr, k, gt)
+                    gt -= 1
+
+                    yield "compare", k, low
+                    if arr[k] < p:
+                        yield from self._swap(arr, k, lt)
+                        lt += 1
+            k += 1
+
+        lt -= 1
+        gt += 1
+        yield from self._swap(arr, low, lt)
+        yield from self._swap(arr, high, gt)
+
+        # With p == q the middle part only holds copies of the pivot and is already sorted
+        if p == q:
+            return [(low, lt - 1), (gt + 1, high)]
+        return [(low, lt - 1), (lt + 1, gt - 1), (gt + 1, high)]
+
+    def _swap(self, arr, i, j):
+        if i != j:
+            arr[i], arr[j] = arr[j], arr[i]
+            yield "swap", i, j
+
+    @staticmethod
+    def _moved(position, i, j):
+        # Where the element at position is after swapping i and j
+        if position == i:
+            return j
+        if position == j:
+            return i
+        return position
+
+    def _choose_pivot(self, low, high):
+        # Pivot index for the segment low..high (inclusive); shared by every engine, scheme and the generator
+        return random.randint(low, high)
+
     def _random_partition(self, arr, low, high):
-        pivot_index = random.randint(low, high)
-        arr[pivot_index], arr[high] = arr[high], arr[pivot_index]
+        pivot_index = self._choose_pivot(low, high)
+        if pivot_index != high:
+            arr[pivot_index], arr[high] = arr[high], arr[pivot_index]
+            self.swaps += 1
 
         return self._partition(arr, low, high)
 
@@ -59,7 +265,146 @@ class QuickSort:
             self.comparisons += 1
             if arr[j] <= pivot:
                 i += 1
-                arr[i], arr[j] = arr[j], arr[i]
+                if i != j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    self.swaps += 1
+
+        if i + 1 != high:
+            arr[i + 1], arr[high] = arr[high], arr[i + 1]
+            self.swaps += 1
+        return i + 1
+
+    def _load(self, arr):
+        # Copies the input into the reusable buffer, reallocating only when it is too short or of another type
+        values = np.asarray(arr)
+        n = len(values)
+
+        if self.buffer is None or len(self.buffer) < n or self.buffer.dtype != values.dtype:
+            self.buffer = np.empty(max(n, 1), dtype=values.dtype)
+            self.scratch = np.empty_like(self.buffer)
+            self.mask = np.empty(len(self.buffer), dtype=bool)
+            self.positions = np.arange(len(self.buffer))
+            self.links = np.empty(len(self.buffer), dtype=np.intp)
+            self.jumps = np.empty(len(self.buffer), dtype=np.intp)
+
+        self.buffer[:n] = values
+        return n
+
+    def _sort_buffer(self, n):
+        """ Sorts buffer[:n] in place and returns the number of comparisons and swaps. """
+        buffer, scratch, mask = self.buffer, self.scratch, self.mask
+        choose_pivot = self._choose_pivot
+        comparisons = swaps = 0
+
+        stack = [(0, n - 1)]
+        while stack:
+            low, high = stack.pop()
+
+            while high - low >= self.SMALL_SEGMENT:
+                pivot_index = choose_pivot(low, high)
+                pivot = buffer[pivot_index]
+                buffer[pivot_index] = buffer[high]
+                buffer[high] = pivot
+
+                # Lomuto's sides: elements <= pivot, the pivot, then the rest, gathered into scratch
+                body = buffer[low:high]
+                length = high - low
+                np.less_equal(body, pivot, out=mask[:length])
+                smaller = int(np.count_nonzero(mask[:length]))
+
+                # Lomuto swaps every element <= pivot that follows a larger one, plus the two pivot moves
+                leading = int(np.argmin(mask[:length])) if smaller < length else length
+                swaps += (pivot_index != high) + (smaller - leading) + (smaller < length)
+
+                body.compress(mask[:length], out=scratch[:smaller])
+                scratch[smaller] = pivot
+                if smaller < length:
+                    self._larger_side(body, mask[leading:length], leading, smaller, scratch[smaller + 1:length + 1])
+                buffer[low:high + 1] = scratch[:length + 1]
+
+                comparisons += length
+                pivot_index = low + smaller
+
+                # The larger side waits; the smaller side is sorted next
+                if pivot_index - low < high - pivot_index:
+                    stack.append((pivot_index + 1, high))
+                    high = pivot_index - 1
+                else:
+                    stack.append((low, pivot_index - 1))
+                    low = pivot_index + 1
+
+            if low < high:
+                counts = self._sort_small(buffer, low, high)
+                comparisons += counts[0]
+                swaps += counts[1]
+
+        return comparisons, swaps
+
+    def _larger_side(self, body, is_small, first_large, smaller, out):
+        """ Writes the elements > pivot of body to out in the order Lomuto's swaps leave them.
+        From the first larger element on, that side is a queue: a larger element joins at its end and each element
+        <= pivot swaps the front to the end. So every position t from first_large on adds one entry to the queue:
+        the element at t if it is larger, else the entry taken off the front, which is entry number (elements
+        <= pivot in first_large..t-1). Following these links back to a larger element (by pointer doubling) gives
+        the element of every entry. The final pivot swap moves the front entry to the end once more. """
+        entries = len(is_small)
+        taken = smaller - first_large
+        links = self.links[:entries]
+        jumps = self.jumps[:entries]
+        positions = self.positions[:entries]
+
+        # Entries added by an element <= pivot link to the entry they took; the others link to themselves
+        np.cumsum(is_small, out=links)
+        np.subtract(links, is_small, out=links)
+        np.subtract(links, positions, out=jumps)
+        np.multiply(jumps, is_small, out=jumps)
+        np.add(positions, jumps, out=links)
+
+        while True:
+            np.take(links, links, out=jumps)
+            if np.array_equal(jumps, links):
+                break
+            links, jumps = jumps, links
+
+        # The queue holds entries taken..entries-1, and the pivot swap moves entry taken behind the others
+        rest = entries - taken - 1
+        np.add(links[taken + 1:], first_large, out=jumps[:rest])
+        body.take(jumps[:rest], out=out[:rest])
+        out[rest] = body[first_large + links[taken]]
+
+    def _sort_small(self, buffer, low, high):
+        # Lomuto on a list copy of a short segment; pivot indices stay in buffer coordinates
+        values = buffer[low:high + 1].tolist()
+        choose_pivot = self._choose_pivot
+        comparisons = swaps = 0
+
+        stack = [(low, high)]
+        while stack:
+            first, last = stack.pop()
+            if first >= last:
+                continue
+
+            pivot_index = choose_pivot(first, last) - low
+            start, end = first - low, last - low
+            if pivot_index != end:
+                values[pivot_index], values[end] = values[end], values[pivot_index]
+                swaps += 1
+
+            pivot = values[end]
+            i = start - 1
+            for j in range(start, end):
+                if values[j] <= pivot:
+                    i += 1
+                    if i != j:
+                        values[i], values[j] = values[j], values[i]
+                        swaps += 1
+            if i + 1 != end:
+                values[i + 1], values[end] = values[end], values[i + 1]
+                swaps += 1
+
+            comparisons += end - start
+            stack.append((first, low + i))
+            stack.append((low + i + 2, last))
 
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
\ No newline at end of file
+        buffer[low:high + 1] = values
+        return comparisons, swaps
@@ -1,24 +1,44 @@
+import numpy as np
 import networkx as nx
 from collections import deque
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+from csrGraph import CSRGraph, bfs_levels, connected_watts_strogatz_csr
+from graphSampling import ConnectedGraphSampler
 
 class RandomGraphBFS:
     """ Random Graph BFS Simulation:
-    Generates a connected random graph and performs BFS traversal. Designed for both Monte Carlo statistical experiments and real-time visualization. """
+    Generates a connected random graph and performs BFS traversal. Designed for both Monte Carlo statistical experiments and real-time visualization.
+    The "networkx" backend builds NetworkX graphs; the "csr" backend builds compact CSRGraph arrays and runs a vectorized frontier BFS. """
 
-    def __init__(self, p=0.1):
+    BACKENDS = ("networkx", "csr")
+
+    def __init__(self, p=0.1, backend="networkx", sampling="rejection"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown graph backend: {backend}")
         self.p = p
+        self.backend = backend
+
+        # Tracks rejected draws; see ConnectedGraphSampler for the sampling strategies
+        self.sampler = ConnectedGraphSampler(p, strategy=sampling, backend=backend)
 
     # Graph generation
     def generate_connected_graph(self, n):
         # Generates a connected random graph G(n, p)
-        while True:
-            G = nx.erdos_renyi_graph(n, self.p)
-            if nx.is_connected(G):
-                return G
+        return self.sampler.sample(n)
+
+    def generate_small_world_graph(self, n, k=4, p=0.1):
+        # Generates a connected Watts-Strogatz graph, the graph model used by the Monte Carlo experiments
+        if self.backend == "csr":
+            return connected_watts_strogatz_csr(n, k, p)
+        return nx.connected_watts_strogatz_graph(n, k=k, p=p)
 
     # BFS execution
     def run_bfs(self, G, start_node=0):
         # Runs BFS on graph G starting from start_node
+        if isinstance(G, CSRGraph):
+            return self.run_bfs_csr(G, start_node)
+
         visited = set()
         queue = deque()
         levels = {}
@@ -40,4 +60,52 @@ class RandomGraphBFS:
         return {
             "nodes_visited": len(visited),
             "tree_height": tree_height
-        }
\ No newline at end of file
+        }
+
+    def run_bfs_csr(self, G, start_node=0):
+        # Level-synchronous BFS over a CSRGraph, expanding a whole frontier per step
+        levels = bfs_levels(G, start_node)
+
+        return {
+            "nodes_visited": int((levels >= 0).sum()),
+            "tree_height": int(levels.max())
+        }
+
+    def run_bfs_batch(self, graphs=None, n=None, k=None, start_nodes=None):
+        """ Runs BFS on k graphs in a single sparse traversal and returns the k tree heights as an array.
+        Either pass graphs (NetworkX or CSRGraph) or n and k to generate k Watts-Strogatz graphs.
+        The graphs are laid out as one block-diagonal adjacency matrix plus a virtual source linked to every
+        start node; one scipy.sparse.csgraph search from that source gives every node's BFS level + 1. """
+        if graphs is None:
+            graphs = [self.generate_small_world_graph(n) for _ in range(k)]
+
+        graphs = [G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G) for G in graphs]
+        start_nodes = np.zeros(len(graphs), dtype=np.int64) if start_nodes is None else np.asarray(start_nodes)
+
+        sizes = np.array([G.n for G in graphs], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        total = int(offsets[-1])
+
+        # Block-diagonal CSR: shift each graph's indices and row pointers by its node / entry offset
+        entries = np.array([len(G.indices) for G in graphs], dtype=np.int64)
+        entry_offsets = np.concatenate(([0], np.cumsum(entries)))
+
+        indices = np.concatenate(
+            [G.indices.astype(np.int64) + offset for G, offset in zip(graphs, offsets[:-1])]
+            + [start_nodes + offsets[:-1]]
+        )
+        indptr = np.concatenate(
+            [G.indptr[:-1].astype(np.int64) + offset for G, offset in zip(graphs, entry_offsets[:-1])]
+            + [[entry_offsets[-1], entry_offsets[-1] + len(graphs)]]
+        )
+
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(total + 1, total + 1)
+        )
+
+        distances = shortest_path(adjacency, method="D", unweighted=True, indices=total)[:total]
+
+        # BFS level = distance from the virtual source - 1; unreachable nodes do not count
+        levels = np.where(np.isinf(distances), -1, distances - 1)
+        return np.maximum.reduceat(levels, offsets[:-1]).astype(np.int64)
@@ -0,0 +1,155 @@
+""" Raw per-trial results as memory-mapped NumPy columns.
+
+A run directory holds one preallocated .npy file per column (n, trial, seed, wall_time and one per metric)
+plus meta.json recording how many rows are valid. Columns are written block by block through
+np.lib.format.open_memmap and read back with mmap_mode="r", so 10^8 trials never have to fit in RAM.
+
+    python rawTrials.py quick_sort_monte_carlo_20250101_120000_raw    # regenerates the CSV summary """
+
+import json
+import os
+import sys
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from streamingStats import RunningStats
+from dataExport import export_csv, timestamp
+
+BASE_COLUMNS = {"n": np.int64, "trial": np.int64, "seed": np.uint64, "wall_time": np.float64}
+
+class RawTrialWriter:
+    """ Appends blocks of kernel results to preallocated memory-mapped columns.
+    Metric columns are created on the first block: int64 for integer metrics, float64 otherwise.
+    Unwritten capacity stays a sparse hole in the file; only the first meta["count"] rows are valid. """
+
+    def __init__(self, output_prefix=""):
+        self.output_prefix = output_prefix
+        self.directory = None
+        self.columns = {}
+        self.meta = {}
+        self.count = 0
+
+    def open(self, prefix, capacity, metrics, meta):
+        self.directory = f"{self.output_prefix}{prefix}_{timestamp()}_raw"
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.columns = {
+            name: self._column(name, dtype, capacity)
+            for name, dtype in BASE_COLUMNS.items()
+        }
+        self.meta = dict(meta, prefix=prefix, metrics=list(metrics), capacity=capacity, count=0)
+        self.count = 0
+        self._write_meta()
+
+    def append(self, n, first_trial, metrics):
+        size = len(metrics["seed"])
+        stop = self.count + size
+
+        if stop > self.meta["capacity"]:
+            raise RuntimeError(f"Raw trial capacity of {self.meta['capacity']} rows exceeded")
+
+        for name in self.meta["metrics"]:
+            if name not in self.columns:
+                values = np.asarray(metrics[name])
+                dtype = np.int64 if values.dtype.kind in "iub" else np.float64
+                self.columns[name] = self._column(name, dtype, self.meta["capacity"])
+
+        self.columns["n"][self.count:stop] = n
+        self.columns["trial"][self.count:stop] = np.arange(first_trial, first_trial + size)
+
+        for name in ["seed", "wall_time"] + self.meta["metrics"]:
+            self.columns[name][self.count:stop] = metrics[name]
+
+        self.count = stop
+
+    def flush(self):
+        self._sync()
+
+        # Remapping releases the written pages, so resident memory stays bounded between flushes
+        self.columns = {
+            name: np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="r+")
+            for name in self.columns
+        }
+
+    def close(self):
+        self._sync()
+        self.columns = {}
+
+    def _sync(self):
+        # Data first, then the row count, so meta.json never claims rows that are not on disk
+        for column in self.columns.values():
+            column.flush()
+
+        self.meta["count"] = self.count
+        self._write_meta()
+
+    def _column(self, name, dtype, capacity):
+        return open_memmap(os.path.join(self.directory, f"{name}.npy"), mode="w+", dtype=dtype, shape=(capacity,))
+
+    def _write_meta(self):
+        path = os.path.join(self.directory, "meta.json")
+
+        with open(path + ".tmp", "w") as file:
+            json.dump(self.meta, file, indent=2, default=str)
+
+        os.replace(path + ".tmp", path)
+
+def load_raw_trials(directory):
+    """ Memory-maps a run directory. Returns (columns, meta); every column is a read-only view of the
+    valid rows, so slicing or reducing it only touches the pages actually needed. """
+    with open(os.path.join(directory, "meta.json")) as file:
+        meta = json.load(file)
+
+    count = meta["count"]
+    columns = {}
+
+    for name in list(BASE_COLUMNS) + meta["metrics"]:
+        path = os.path.join(directory, f"{name}.npy")
+        if os.path.exists(path):
+            columns[name] = np.load(path, mmap_mode="r")[:count]
+
+    return columns, meta
+
+def summarize_raw_trials(directory, chunk_size=1_000_000):
+    """ Rebuilds the (rows, headers, prefix) of the CSV the run would have exported.
+    Monte Carlo means and variances are merged chunk by chunk, so memory use is bounded by chunk_size. """
+    columns, meta = load_raw_trials(directory)
+    metrics = meta["metrics"]
+
+    if meta["mode"] == "Histogram":
+        values = columns[metrics[0]]
+        rows = (
+            [value]
+            for start in range(0, len(values), chunk_size)
+            for value in values[start:start + chunk_size].tolist()
+        )
+        return rows, ["value"], meta["prefix"]
+
+    accumulators = {}
+    n_column = columns["n"]
+
+    for start in range(0, len(n_column), chunk_size):
+        n_chunk = np.asarray(n_column[start:start + chunk_size])
+
+        for n in np.unique(n_chunk):
+            mask = n_chunk == n
+            stats = accumulators.setdefault(int(n), {name: RunningStats() for name in metrics})
+
+            for name in metrics:
+                stats[name].update_batch(columns[name][start:start + chunk_size][mask])
+
+    rows = []
+    for n in sorted(accumulators):
+        main = accumulators[n][metrics[0]]
+        rows.append([n, main.mean, main.variance, main.count] + [accumulators[n][name].mean for name in metrics[1:]])
+
+    return rows, meta["headers"], meta["prefix"]
+
+def export_raw_summary(directory, output_prefix=""):
+    """ Writes the regenerated CSV summary of a run directory and returns its file name. """
+    rows, headers, prefix = summarize_raw_trials(directory)
+    return export_csv(rows, headers, output_prefix + prefix)
+
+if __name__ == "__main__":
+    for directory in sys.argv[1:]:
+        print(f"{directory}: saved to {export_raw_summary(directory)}")
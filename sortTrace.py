@@ -0,0 +1,72 @@
+import numpy as np
+
+from quickSort import QuickSort
+
+class SortTrace:
+    """ Compact record of one Quick Sort run, replayable in both directions.
+    The initial array is stored once, followed by one (event, first, second) row per step in small integer
+    arrays, instead of an array copy per step. Swaps are their own inverse, so any step is reached from
+    the current one by applying (forwards) or undoing (backwards) only the swaps in between. """
+
+    EVENTS = ("compare", "swap", "pivot")
+    COMPARE, SWAP, PIVOT = range(3)
+
+    def __init__(self, initial, events, first, second):
+        self.initial = np.array(initial)
+        self.events = events
+        self.first = first
+        self.second = second
+
+        self.array = self.initial.copy()
+        self.position = 0
+
+    @classmethod
+    def record(cls, arr, sorter=None):
+        """ Runs the sort generator once and keeps its events. """
+        sorter = sorter or QuickSort()
+        codes = {name: code for code, name in enumerate(cls.EVENTS)}
+
+        events, first, second = [], [], []
+        for event, i, j in sorter.sort_generator(arr):
+            events.append(codes[event])
+            first.append(i)
+            second.append(j)
+
+        return cls(arr, np.array(events, dtype=np.int8), np.array(first, dtype=np.int32),
+                   np.array(second, dtype=np.int32))
+
+    def __len__(self):
+        return len(self.events)
+
+    def seek(self, step):
+        """ Moves to step (0 = initial array, len(trace) = sorted) and returns the indices whose values changed. """
+        step = min(max(int(step), 0), len(self))
+
+        if step >= self.position:
+            span = np.arange(self.position, step)
+        else:
+            span = np.arange(step, self.position)[::-1]
+
+        swaps = span[self.events[span] == self.SWAP]
+        array = self.array
+
+        for i, j in zip(self.first[swaps].tolist(), self.second[swaps].tolist()):
+            array[i], array[j] = array[j], array[i]
+
+        self.position = step
+        return np.unique(np.concatenate((self.first[swaps], self.second[swaps])))
+
+    def highlight(self):
+        """ Indices involved in the last applied step. """
+        if self.position == 0:
+            return []
+
+        step = self.position - 1
+        if self.events[step] == self.PIVOT:
+            return [int(self.first[step])]
+        return [int(self.first[step]), int(self.second[step])]
+
+    def counts(self):
+        # Comparisons and swaps up to the current step
+        done = self.events[:self.position]
+        return int(np.count_nonzero(done == self.COMPARE)), int(np.count_nonzero(done == self.SWAP))
@@ -0,0 +1,59 @@
+import math
+import numpy as np
+from scipy import stats
+
+class RunningStats:
+    """ Streaming mean / variance accumulator (Welford), so Monte Carlo loops never keep per-trial lists.
+    Blocks of values are merged with Chan's parallel update, which gives the same result as feeding them
+    one at a time. """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update_batch(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+
+        batch_mean = values.mean()
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+
+        total = self.count + values.size
+        delta = batch_mean - self.mean
+
+        self.mean += delta * values.size / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * values.size / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        # Sample variance (ddof=1), matching np.var(results, ddof=1)
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    def confidence_half_width(self, confidence=0.95):
+        """ Half-width of the t confidence interval of the mean, as in monteCarloTest.analyze_results. """
+        if self.count < 2:
+            return math.inf
+        return stats.t.ppf((1 + confidence) / 2, self.count - 1) * math.sqrt(self.variance / self.count)
+
+    def converged(self, tolerance, confidence=0.95):
+        # Relative precision reached: CI half-width <= tolerance * |mean|
+        return self.confidence_half_width(confidence) <= tolerance * abs(self.mean)
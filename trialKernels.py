@@ -0,0 +1,240 @@
+""" Per-trial work for the Monte Carlo runners.
+Every kernel takes (n, seeds, params) and returns a dict of metric name -> list with one entry per seed.
+Each trial reseeds the global random and np.random state from its own SeedSequence, so a trial's result
+depends only on its seed and never on which process or in which order it ran. Quick Sort inputs are generated
+for many trials at once by an InputPool (inputDistributions.py), each row from its own trial's seed.
+Besides their metrics, kernels report each trial's 64-bit seed ("seed") and wall time in seconds ("wall_time").
+With params["phases"] set they also report the seconds each trial spent per phase ("phase_generate", ...).
+With params["measure"] set to "runtime" or "peak_memory" they report the algorithm's perf_counter_ns runtime
+("runtime_ns") or tracemalloc peak allocation ("peak_bytes") per trial; input generation and the oracle are
+never part of the measurement. """
+
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+
+from quickSort import QuickSort
+from randomGraphBFS import RandomGraphBFS
+from kargerMinCut import KargerMinCut
+from minCutOracle import MinCutOracle
+from phaseTiming import PhaseTimer
+from inputDistributions import InputPool
+
+# Measured metric -> params["measure"] that makes the kernels report it
+MEASURES = {"runtime_ns": "runtime", "peak_bytes": "peak_memory"}
+
+# One oracle per process; the on-disk cache is shared between processes
+_oracle = None
+
+def trial_seed(seed_seq):
+    # 64-bit seed of a trial
+    state = seed_seq.generate_state(2)
+    return (int(state[0]) << 32) | int(state[1])
+
+def seed_globals(seed_seq):
+    # Seeds both global generators used by the algorithms and by NetworkX; returns the 64-bit seed
+    seed = trial_seed(seed_seq)
+    random.seed(seed)
+    np.random.seed(seed_seq.generate_state(2))
+    return seed
+
+def get_oracle():
+    global _oracle
+    if _oracle is None:
+        _oracle = MinCutOracle()
+    return _oracle
+
+def measure_call(measure, call, *args):
+    """ Runs call(*args) and returns (result, measurement): the runtime in nanoseconds, the peak bytes
+    allocated above the memory already traced (inside tracing()), or None when nothing is measured. """
+    if measure == "runtime":
+        start = time.perf_counter_ns()
+        result = call(*args)
+        return result, time.perf_counter_ns() - start
+
+    if measure == "peak_memory":
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = call(*args)
+        return result, tracemalloc.get_traced_memory()[1] - base
+
+    return call(*args), None
+
+@contextmanager
+def tracing(measure):
+    # Traces allocations for the block when peak memory is measured; tracing slows everything else down
+    started = measure == "peak_memory" and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+def attach_measure(metrics, measure, values):
+    for name, value in MEASURES.items():
+        if value == measure:
+            metrics[name] = values
+    return metrics
+
+def quick_sort_trials(n, seeds, params):
+    # Inputs come from a pool filled for many trials at once; the "buffer" engine also reuses its sort buffer
+    algorithm = QuickSort(params.get("sort_engine", "recursive"), params.get("partition", "lomuto"))
+    pool = InputPool(params.get("distribution", "uniform"))
+    timer = PhaseTimer(params.get("phases", False))
+    measure = params.get("measure")
+    comparisons = []
+    swaps = []
+    measured = []
+    trial_seeds = []
+    wall_times = []
+
+    rows = pool.rows(n)
+    with tracing(measure):
+        for first in range(0, len(seeds), rows):
+            block = seeds[first:first + rows]
+
+            start = time.perf_counter()
+            inputs = pool.fill(n, [trial_seed(seed) for seed in block])
+            generate = time.perf_counter() - start
+            timer.spread("generate", generate, len(block))
+
+            for seed, arr in zip(block, inputs):
+                start = time.perf_counter()
+                trial_seeds.append(seed_globals(seed))
+                timer.start()
+                result, value = measure_call(measure, algorithm.sort, arr)
+                comparisons.append(result["comparisons"])
+                swaps.append(result["swaps"])
+                measured.append(value)
+                timer.lap("algorithm")
+                wall_times.append(time.perf_counter() - start + generate / len(block))
+
+    metrics = {"comparisons": comparisons, "swaps": swaps, "seed": trial_seeds, "wall_time": wall_times}
+    return attach_measure(timer.attach(metrics), measure, measured)
+
+def bfs_trials(n, seeds, params):
+    bfs_sim = RandomGraphBFS(backend=params.get("graph_backend", "networkx"))
+    timer = PhaseTimer(params.get("phases", False))
+    graphs = []
+    trial_seeds = []
+    wall_times = []
+
+    for seed in seeds:
+        start = time.perf_counter()
+        trial_seeds.append(seed_globals(seed))
+        timer.start()
+        graphs.append(bfs_sim.generate_small_world_graph(n, k=4, p=0.1))
+        timer.lap("generate")
+        wall_times.append(time.perf_counter() - start)
+
+    measure = params.get("measure")
+    start = time.perf_counter()
+
+    with tracing(measure):
+        if measure == "peak_memory":
+            # Peaks do not add up, so each graph is traversed and measured on its own
+            results = [measure_call(measure, bfs_sim.run_bfs, G) for G in graphs]
+            heights = [result["tree_height"] for result, _ in results]
+            measured = [value for _, value in results]
+        else:
+            # One sparse traversal covers the whole block of trials; each trial is charged an equal share of it
+            heights, batch_ns = measure_call(measure, bfs_sim.run_bfs_batch, graphs)
+            heights = heights.tolist()
+            measured = [batch_ns // max(1, len(graphs))] * len(graphs) if measure else []
+
+    elapsed = time.perf_counter() - start
+    share = elapsed / max(1, len(graphs))
+    timer.spread("algorithm", elapsed, len(graphs))
+
+    metrics = {"tree_height": heights, "seed": trial_seeds, "wall_time": [t + share for t in wall_times]}
+    return attach_measure(timer.attach(metrics), measure, measured)
+
+def karger_trials(n, seeds, params):
+    # One trial = one random graph scored by params["k"] Karger runs
+    karger = KargerMinCut(params.get("engine", "union_find"), params.get("sampling", "rejection"))
+    timer = PhaseTimer(params.get("phases", False))
+    measure = params.get("measure")
+    probabilities = []
+    rejections = []
+    measured = []
+    trial_seeds = []
+    wall_times = []
+
+    with tracing(measure):
+        for seed in seeds:
+            start = time.perf_counter()
+            trial_seeds.append(seed_globals(seed))
+            timer.start()
+            G = karger.generate_graph(n)
+            rejections.append(karger.sampler.last_rejections)
+            timer.lap("generate")
+            true_cut = get_oracle().min_cut(G)
+            timer.lap("oracle")
+            graph = karger.prepare(G)
+
+            # Measures all k runs on the graph, the unit of work of one trial; the conversion above is not measured
+            cuts, value = measure_call(measure, karger.run_karger_trials, graph, params["k"])
+            probabilities.append(float(np.count_nonzero(cuts == true_cut) / params["k"]))
+            measured.append(value)
+            timer.lap("algorithm")
+            wall_times.append(time.perf_counter() - start)
+
+    return attach_measure(timer.attach({
+        "success_probability": probabilities,
+        "rejections": rejections,
+        "seed": trial_seeds,
+        "wall_time": wall_times
+    }), measure, measured)
+
+def karger_stein_trials(n, seeds, params):
+    # One trial = one random graph scored by params["k"] Karger-Stein runs
+    karger = KargerMinCut(sampling=params.get("sampling", "rejection"))
+    timer = PhaseTimer(params.get("phases", False))
+    measure = params.get("measure")
+    probabilities = []
+    contractions = []
+    rejections = []
+    measured = []
+    trial_seeds = []
+    wall_times = []
+
+    def run_k(graph):
+        return [karger.run_karger_stein(graph) for _ in range(params["k"])]
+
+    with tracing(measure):
+        for seed in seeds:
+            start = time.perf_counter()
+            trial_seeds.append(seed_globals(seed))
+            timer.start()
+            G = karger.generate_graph(n)
+            rejections.append(karger.sampler.last_rejections)
+            timer.lap("generate")
+            true_cut = get_oracle().min_cut(G)
+            timer.lap("oracle")
+            graph = karger.to_edge_arrays(G)
+
+            results, value = measure_call(measure, run_k, graph)
+            probabilities.append(sum(r["cut_size"] == true_cut for r in results) / params["k"])
+            contractions.append(float(np.mean([r["contractions"] for r in results])))
+            measured.append(value)
+            timer.lap("algorithm")
+            wall_times.append(time.perf_counter() - start)
+
+    return attach_measure(timer.attach({
+        "success_probability": probabilities,
+        "contractions": contractions,
+        "rejections": rejections,
+        "seed": trial_seeds,
+        "wall_time": wall_times
+    }), measure, measured)
+
+KERNELS = {
+    "quick_sort": quick_sort_trials,
+    "bfs": bfs_trials,
+    "karger": karger_trials,
+    "karger_stein": karger_stein_trials
+}